@@ -0,0 +1,145 @@
+"""
+Estimación analítica de la espera con fila única para el modelo de gptvale.py, sin simular.
+
+  - Erlang-C (M/M/k): probabilidad de esperar y espera media con servicio exponencial.
+  - Allen-Cunneen (GI/G/k): la espera de M/M/k corregida por (ca² + cs²) / 2, con los
+    coeficientes de variación al cuadrado de los tiempos entre llegadas y de atención.
+    Con llegadas más regulares que Poisson (ca² < 1, como las de gptvale.py) Allen-Cunneen
+    sobreestima la espera, y se aplica el factor de Kraemer-Langenbach-Belz.
+
+Cada consulta cuesta microsegundos y las respuestas quedan en cache. Si la aproximación no es
+confiable (cerca de la saturación, mucha variabilidad, una corrección grande o una corrida muy corta
+para llegar al régimen) el resultado lo indica y estimar_espera puede simular en su lugar.
+"""
+import math
+from functools import lru_cache
+
+import gptvale
+
+UTILIZACION_MAXIMA_CONFIABLE = 0.9  # Más cerca de 1 el error relativo crece mucho
+VARIABILIDAD_MAXIMA_CONFIABLE = 2  # Tope para ca² y cs²
+RELAJACIONES_MINIMAS = 20  # La corrida debe durar varias veces el tiempo de relajación
+CORRECCION_MINIMA_CONFIABLE = 0.75  # Si el factor de Kraemer-Langenbach-Belz corrige más, no se confía
+
+
+def momentos_tiempo_en_caja(mu_productos=gptvale.mu_productos, sigma_productos=gptvale.sigma_productos,
+                            p_pago_efectivo=gptvale.p_pago_efectivo, tiempo_efectivo=gptvale.tiempo_efectivo,
+                            tiempo_otro_medio=gptvale.tiempo_otro_medio):
+    """
+    Media y varianza exactas del tiempo en caja de gptvale.generar_clientes:
+    max(0, Normal(mu, sigma)) productos más un tiempo de pago que vale tiempo_efectivo con
+    probabilidad p_pago_efectivo y tiempo_otro_medio si no (independiente de los productos).
+    :return: (media, varianza)
+    """
+    z = mu_productos / sigma_productos
+    fi = 0.5 * (1 + math.erf(z / math.sqrt(2)))
+    densidad = math.exp(-z * z / 2) / math.sqrt(2 * math.pi)
+    media_productos = mu_productos * fi + sigma_productos * densidad
+    segundo_momento = (mu_productos ** 2 + sigma_productos ** 2) * fi + mu_productos * sigma_productos * densidad
+    varianza_productos = segundo_momento - media_productos ** 2
+
+    media_pago = p_pago_efectivo * tiempo_efectivo + (1 - p_pago_efectivo) * tiempo_otro_medio
+    varianza_pago = p_pago_efectivo * (1 - p_pago_efectivo) * (tiempo_efectivo - tiempo_otro_medio) ** 2
+    return media_productos + media_pago, varianza_productos + varianza_pago
+
+
+def erlang_c(k, carga):
+    """
+    Probabilidad de que un cliente tenga que esperar en M/M/k con carga = lambda / mu.
+    Usa la recursión de Erlang B, que no desborda con k grande.
+    """
+    if carga >= k:
+        return 1.0
+    erlang_b = 1.0
+    for j in range(1, k + 1):
+        erlang_b = carga * erlang_b / (j + carga * erlang_b)
+    return erlang_b / (1 - carga / k * (1 - erlang_b))
+
+
+def allen_cunneen(k, tasa_llegadas, media_servicio, varianza_servicio, ca2=1.0, num_clientes=None):
+    """
+    Espera media en la fila para k cajas con fila única.
+    :param tasa_llegadas: Clientes por minuto.
+    :param ca2: Coeficiente de variación al cuadrado de los tiempos entre llegadas (1 si Poisson).
+    :param num_clientes: Clientes de la corrida a comparar; si se da, se exige que dure bastante
+                         más que el tiempo de relajación para considerar confiable el resultado.
+    :return: Diccionario con espera_media, espera_allen_cunneen (sin corregir), espera_mmk,
+             prob_esperar, utilizacion, confiable y motivo. Es una copia: se puede modificar
+             sin tocar la cache.
+    """
+    return dict(_allen_cunneen(k, tasa_llegadas, media_servicio, varianza_servicio, ca2, num_clientes))
+
+
+@lru_cache(maxsize=4096)
+def _allen_cunneen(k, tasa_llegadas, media_servicio, varianza_servicio, ca2, num_clientes):
+    carga = tasa_llegadas * media_servicio
+    utilizacion = carga / k
+    cs2 = varianza_servicio / media_servicio ** 2
+    if utilizacion >= 1:
+        return {'espera_media': math.inf, 'espera_allen_cunneen': math.inf, 'espera_mmk': math.inf,
+                'prob_esperar': 1.0, 'utilizacion': utilizacion, 'confiable': False, 'motivo': 'inestable'}
+
+    prob_esperar = erlang_c(k, carga)
+    espera_mmk = prob_esperar * media_servicio / (k - carga)
+    espera_allen_cunneen = espera_mmk * (ca2 + cs2) / 2
+    correccion = 1.0
+    if ca2 < 1 and utilizacion > 0:
+        correccion = math.exp(-2 * (1 - utilizacion) * (1 - ca2) ** 2 / (3 * utilizacion * (ca2 + cs2)))
+
+    motivo = None
+    if utilizacion > UTILIZACION_MAXIMA_CONFIABLE:
+        motivo = 'utilizacion_alta'
+    elif max(ca2, cs2) > VARIABILIDAD_MAXIMA_CONFIABLE:
+        motivo = 'variabilidad_alta'
+    elif correccion < CORRECCION_MINIMA_CONFIABLE:
+        motivo = 'correccion_grande'
+    elif num_clientes is not None:
+        # Tiempo de relajación de la fila, del orden de E[S] / (k (1 - sqrt(rho))^2)
+        relajacion = media_servicio / (k * (1 - math.sqrt(utilizacion)) ** 2)
+        if num_clientes / tasa_llegadas < RELAJACIONES_MINIMAS * relajacion:
+            motivo = 'corrida_corta'
+    return {
+        'espera_media': espera_allen_cunneen * correccion,
+        'espera_allen_cunneen': espera_allen_cunneen,
+        'espera_mmk': espera_mmk,
+        'prob_esperar': prob_esperar,
+        'utilizacion': utilizacion,
+        'confiable': motivo is None,
+        'motivo': motivo,
+    }
+
+
+def estimar_espera(k=gptvale.k, n=gptvale.n, mu_llegadas=gptvale.mu_llegadas, simular_si_no_confiable=True,
+                   num_replicas=200, semilla=None, **parametros):
+    """
+    Espera media con fila única para el modelo de gptvale.py: analítica si es confiable y, si
+    no, por simulación (replicas.ejecutar_replicas_vectorizadas con n clientes).
+    Los tiempos entre llegadas son Poisson(mu_llegadas), así que ca² = 1 / mu_llegadas.
+    :param parametros: Parámetros del tiempo en caja (mu_productos, p_pago_efectivo, ...).
+    :return: Diccionario de allen_cunneen con 'metodo' ('analitico' o 'simulacion') y, si se
+             simuló, 'espera_semiancho'.
+    """
+    media, varianza = momentos_tiempo_en_caja(**parametros)
+    resultado = allen_cunneen(k, 1 / mu_llegadas, media, varianza, 1 / mu_llegadas, n)
+    resultado['metodo'] = 'analitico'
+    if resultado['confiable'] or not simular_si_no_confiable:
+        return resultado
+
+    from replicas import ejecutar_replicas_vectorizadas  # Solo se importa si hace falta simular
+
+    simulado = ejecutar_replicas_vectorizadas(num_replicas, n, k, semilla, mu_llegadas=mu_llegadas, **parametros)
+    resultado.update(
+        metodo='simulacion',
+        espera_media=float(simulado['espera_media']),
+        espera_semiancho=float(simulado['espera_semiancho']),
+        utilizacion=float(simulado['utilizacion_media']),
+    )
+    return resultado
+
+
+if __name__ == "__main__":
+    for cajas in range(2, 6):
+        resultado = estimar_espera(cajas, n=100_000, simular_si_no_confiable=False)
+        print(f"{cajas} cajas: espera media ≈ {resultado['espera_media']:.3f} min, "
+              f"utilización {resultado['utilizacion']:.2f}"
+              f"{'' if resultado['confiable'] else ' (no confiable: ' + resultado['motivo'] + ')'}")
@@ -0,0 +1,97 @@
+import csv
+import hashlib
+import itertools
+import json
+import os
+
+import gptvale
+from cache_clientes import CACHE_CLIENTES
+from replicas import ejecutar_replicas_vectorizadas
+
+# Cambiar cuando cambie el modelo de gptvale.py o el kernel, para no reutilizar resultados viejos
+VERSION_MODELO = 1
+DIRECTORIO_CACHE = '.cache_barrido'
+
+
+def clave_celda(parametros, n, num_replicas, semilla):
+    # Hash del contenido: mismos parámetros, versión y semilla dan siempre la misma clave
+    contenido = {
+        'parametros': parametros,
+        'n': n,
+        'replicas': num_replicas,
+        'semilla': semilla,
+        'version': VERSION_MODELO,
+    }
+    texto = json.dumps(contenido, sort_keys=True, default=float)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def _ruta_cache(directorio, clave):
+    # Dos niveles para no juntar miles de archivos en un solo directorio
+    return os.path.join(directorio, clave[:2], clave + '.json')
+
+
+def leer_cache(directorio, clave):
+    try:
+        with open(_ruta_cache(directorio, clave), encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def guardar_cache(directorio, clave, fila):
+    ruta = _ruta_cache(directorio, clave)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    # Escribir a un temporal y renombrar, así un corte no deja un archivo a medias
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(fila, archivo)
+    os.replace(temporal, ruta)
+
+
+def barrer(grilla, num_replicas=1000, n=gptvale.n, semilla=0, directorio_cache=DIRECTORIO_CACHE):
+    """
+    Recorre el producto cartesiano de la grilla y devuelve una fila por combinación.
+    Solo se simulan las celdas que no están en la cache; el resto se lee del disco.
+    :param grilla: Diccionario parámetro -> lista de valores. Acepta k y los parámetros de
+                   gptvale.generar_clientes (mu_llegadas, p_pago_efectivo, tiempo_otro_medio, ...).
+    :param semilla: Semilla común a todas las celdas (números aleatorios comunes entre celdas).
+    :return: Lista de diccionarios con los parámetros y los resultados de cada celda.
+    """
+    nombres = sorted(grilla)
+    filas = []
+    for valores in itertools.product(*(grilla[nombre] for nombre in nombres)):
+        parametros = dict(zip(nombres, valores))
+        clave = clave_celda(parametros, n, num_replicas, semilla)
+        fila = leer_cache(directorio_cache, clave)
+        if fila is None:
+            generacion = dict(parametros)
+            k = generacion.pop('k', gptvale.k)
+            # Las celdas que solo cambian k comparten los clientes generados
+            resumen = ejecutar_replicas_vectorizadas(num_replicas, n, k, semilla, cache=CACHE_CLIENTES, **generacion)
+            fila = {
+                **parametros,
+                'n': n,
+                'replicas': num_replicas,
+                'espera_media': float(resumen['espera_media']),
+                'espera_semiancho': float(resumen['espera_semiancho']),
+                'utilizacion_media': float(resumen['utilizacion_media']),
+                'utilizacion_semiancho': float(resumen['utilizacion_semiancho']),
+            }
+            guardar_cache(directorio_cache, clave, fila)
+        filas.append(fila)
+    return filas
+
+
+def guardar_csv(filas, ruta):
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=list(filas[0]))
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+if __name__ == "__main__":
+    filas = barrer({'k': [2, 3, 4], 'mu_llegadas': [2, 3], 'p_pago_efectivo': [0.4, 0.8]}, num_replicas=500)
+    for fila in filas:
+        print(f"k={fila['k']}, mu_llegadas={fila['mu_llegadas']}, p_pago_efectivo={fila['p_pago_efectivo']}: "
+              f"espera media = {fila['espera_media']:.2f} ± {fila['espera_semiancho']:.2f} min")
@@ -0,0 +1,153 @@
+"""
+Compara velocidad y memoria de las distintas implementaciones de la simulación.
+
+    python benchmark.py -o resultados_benchmark.jsonl --clientes 1000 10000 100000 --cajas 1 3 100
+
+Cada caso (motor, num_clientes, num_cajas) corre en un proceso nuevo, así el pico de memoria
+(RSS) es el de ese caso solo. Se escribe un registro JSON por caso con el tiempo de pared,
+el pico de RSS y los clientes por segundo. Si un motor supera el límite de tiempo o de
+memoria para un num_clientes, los tamaños mayores con esas cajas se marcan como omitidos.
+Solo se mide la simulación: sin menús, sin gráficos y sin el costo de importar módulos.
+"""
+import argparse
+import importlib
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+def _script(modulo, **opciones):
+    # Los scripts viejos exponen simular(num_cajas, num_clientes, ..., rng=None)
+    def correr(n, k, rng):
+        importlib.import_module(modulo).simular(k, n, rng=rng, **opciones)
+    return correr
+
+
+def _gptvale(funcion):
+    def correr(n, k, rng):
+        gptvale = importlib.import_module('gptvale')
+        tiempos_llegada, tiempos_en_caja = gptvale.generar_clientes(n, rng)
+        getattr(gptvale, funcion)(n, k, tiempos_llegada, tiempos_en_caja)
+    return correr
+
+
+def _motor(disciplina):
+    def correr(n, k, rng):
+        from lote_clientes import generar_en_bloques
+        from motor_eventos import simular_en_bloques
+
+        bloques = ((lote.tiempos_llegada, lote.tiempos_en_caja) for lote in generar_en_bloques(n, rng=rng))
+        simular_en_bloques(k, bloques, disciplina)
+    return correr
+
+
+MOTORES = {
+    'simulacion_colas': _script('simulacion_colas'),
+    'gpt': _script('gpt'),
+    'gptdos': _script('gptdos'),
+    'gpttres': _script('gpttres', opcion='1'),
+    'gpttres_por_caja': _script('gpttres', opcion='2'),
+    'gptvale_unica': _gptvale('simular_fila_unica'),
+    'gptvale_separadas': _gptvale('simular_filas_separadas'),
+    'motor_eventos_unica': _motor('unica'),
+    'motor_eventos_por_caja': _motor('por_caja'),
+}
+# Los módulos que usa cada motor se importan antes de medir
+MODULOS = {
+    'simulacion_colas': ['simulacion_colas'],
+    'gpt': ['gpt'],
+    'gptdos': ['gptdos'],
+    'gpttres': ['gpttres'],
+    'gpttres_por_caja': ['gpttres'],
+    'gptvale_unica': ['gptvale'],
+    'gptvale_separadas': ['gptvale'],
+    'motor_eventos_unica': ['lote_clientes', 'motor_eventos'],
+    'motor_eventos_por_caja': ['lote_clientes', 'motor_eventos'],
+}
+
+
+def correr_caso(motor, n, k, semilla, memoria_mb):
+    # Se ejecuta en el proceso hijo; imprime el resultado como JSON
+    if memoria_mb:
+        limite = memoria_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limite, limite))
+    for modulo in MODULOS[motor]:
+        importlib.import_module(modulo)
+    rng = np.random.default_rng(semilla)
+    rss_base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    inicio = time.perf_counter()
+    try:
+        MOTORES[motor](n, k, rng)
+        estado = 'ok'
+    except MemoryError:
+        estado = 'sin_memoria'
+    segundos = time.perf_counter() - inicio
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KB en Linux
+    print(json.dumps({
+        'estado': estado,
+        'segundos': segundos,
+        'rss_pico_mb': rss / 1024,
+        'rss_base_mb': rss_base / 1024,
+    }))
+
+
+def medir(motor, n, k, semilla, limite_segundos, memoria_mb):
+    registro = {'motor': motor, 'num_clientes': n, 'num_cajas': k}
+    comando = [sys.executable, __file__, '--caso', motor, str(n), str(k), str(semilla), str(memoria_mb)]
+    try:
+        proceso = subprocess.run(comando, capture_output=True, text=True, timeout=limite_segundos)
+    except subprocess.TimeoutExpired:
+        return {**registro, 'estado': 'tiempo_agotado', 'segundos': limite_segundos}
+    if proceso.returncode != 0:
+        ultima_linea = (proceso.stderr.strip().splitlines() or ['error'])[-1]
+        return {**registro, 'estado': 'error', 'detalle': ultima_linea}
+    resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+    if resultado['estado'] == 'ok':
+        resultado['clientes_por_segundo'] = n / resultado['segundos'] if resultado['segundos'] > 0 else None
+    return {**registro, **resultado}
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los motores de simulación.")
+    parser.add_argument('--motores', nargs='+', choices=list(MOTORES), default=list(MOTORES))
+    parser.add_argument('--clientes', nargs='+', type=int, default=[10**3, 10**4, 10**5, 10**6, 10**7])
+    parser.add_argument('--cajas', nargs='+', type=int, default=[1, 3, 10, 100, 500])
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--limite-segundos', type=float, default=300)
+    parser.add_argument('--memoria-mb', type=int, default=8192, help="Límite de memoria por caso (0 sin límite)")
+    parser.add_argument('-o', '--salida', default='resultados_benchmark.jsonl')
+    parser.add_argument('--caso', nargs=5, help=argparse.SUPPRESS)
+    args = parser.parse_args(argumentos)
+
+    if args.caso:
+        motor, n, k, semilla, memoria_mb = args.caso
+        correr_caso(motor, int(n), int(k), int(semilla), int(memoria_mb))
+        return 0
+
+    with open(args.salida, 'w', encoding='utf-8') as salida:
+        for motor in args.motores:
+            for k in sorted(args.cajas):
+                omitir = False
+                for n in sorted(args.clientes):
+                    if omitir:
+                        registro = {'motor': motor, 'num_clientes': n, 'num_cajas': k, 'estado': 'omitido'}
+                    else:
+                        registro = medir(motor, n, k, args.semilla, args.limite_segundos, args.memoria_mb)
+                        # Si no terminó con este tamaño, con uno mayor tampoco
+                        omitir = registro['estado'] != 'ok'
+                    salida.write(json.dumps(registro) + '\n')
+                    salida.flush()
+                    if registro['estado'] == 'ok':
+                        print(f"{motor:24} n={n:>9} k={k:>4}: {registro['segundos']:8.3f} s, "
+                              f"{registro['rss_pico_mb']:8.1f} MB, {registro['clientes_por_segundo']:12.0f} clientes/s")
+                    else:
+                        print(f"{motor:24} n={n:>9} k={k:>4}: {registro['estado']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
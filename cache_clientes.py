@@ -0,0 +1,105 @@
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from lote_clientes import ClienteBatch
+
+MAXIMO_BYTES = 256 * 1024 * 1024
+
+
+def _tamano(valor):
+    # Bytes de los arreglos de NumPy dentro de valor (tuplas, listas u objetos como ClienteBatch)
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, (tuple, list)):
+        return sum(_tamano(v) for v in valor)
+    if hasattr(valor, '__dict__'):
+        return sum(_tamano(v) for v in vars(valor).values())
+    return 0
+
+
+def _solo_lectura(valor):
+    # Lo guardado se comparte entre los que lo piden: que nadie lo modifique por error
+    if isinstance(valor, np.ndarray):
+        valor.flags.writeable = False
+    elif isinstance(valor, (tuple, list)):
+        for v in valor:
+            _solo_lectura(v)
+    elif hasattr(valor, '__dict__'):
+        for v in vars(valor).values():
+            _solo_lectura(v)
+
+
+class CacheClientes:
+    """
+    Cache LRU, acotada en bytes, de clientes ya generados (arreglos de NumPy o ClienteBatch).
+    Llegadas, productos y medio de pago dependen solo del estado del generador y de los
+    parámetros, así que al cambiar la disciplina o la cantidad de cajas se reutilizan.
+    Los arreglos devueltos son de solo lectura.
+    :param maximo_bytes: Tamaño máximo de lo guardado; se descarta lo usado hace más tiempo.
+    """
+
+    def __init__(self, maximo_bytes=MAXIMO_BYTES):
+        self.maximo_bytes = maximo_bytes
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()  # clave -> (valor, estado del generador después, bytes)
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def vaciar(self):
+        self._entradas.clear()
+        self.bytes = 0
+
+    def generar(self, funcion, rng, *argumentos, **parametros):
+        """
+        Devuelve funcion(*argumentos, rng=rng, **parametros), desde la cache si ya se generó con
+        el mismo estado de rng y los mismos argumentos. En los dos casos rng queda en el estado en
+        que lo dejaría la función, así que lo que se sortee después no cambia por usar la cache.
+        """
+        contenido = {
+            'funcion': f"{funcion.__module__}.{funcion.__qualname__}",
+            'estado': rng.bit_generator.state,
+            'argumentos': argumentos,
+            'parametros': parametros,
+        }
+        texto = json.dumps(contenido, sort_keys=True, default=float)
+        clave = hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            valor, estado, _ = entrada
+            rng.bit_generator.state = estado
+            return valor
+
+        self.fallos += 1
+        valor = funcion(*argumentos, rng=rng, **parametros)
+        _solo_lectura(valor)
+        tamano = _tamano(valor)
+        if tamano <= self.maximo_bytes:
+            self._entradas[clave] = (valor, rng.bit_generator.state, tamano)
+            self.bytes += tamano
+            while self.bytes > self.maximo_bytes:
+                _, (_, _, liberados) = self._entradas.popitem(last=False)
+                self.bytes -= liberados
+        return valor
+
+    def lote(self, num_clientes, rng, **parametros):
+        """
+        ClienteBatch.generar(num_clientes, rng=rng, **parametros) desde la cache. Se devuelve una
+        copia con su propio tiempo_espera, que es la única columna que completan las cajas.
+        """
+        lote = copy.copy(self.generar(ClienteBatch.generar, rng, num_clientes, **parametros))
+        lote.tiempo_espera = np.zeros(len(lote))
+        return lote
+
+
+# Cache compartida por defecto dentro de un proceso
+CACHE_CLIENTES = CacheClientes()
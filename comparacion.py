@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+
+import gptvale
+from analitico import momentos_tiempo_en_caja
+from motor_eventos import simular_fila_unica, simular_filas_separadas
+from replicas import intervalo_confianza
+
+
+def media_tiempo_en_caja(mu_productos=gptvale.mu_productos, sigma_productos=gptvale.sigma_productos,
+                         p_pago_efectivo=gptvale.p_pago_efectivo, tiempo_efectivo=gptvale.tiempo_efectivo,
+                         tiempo_otro_medio=gptvale.tiempo_otro_medio, **_):
+    # Media exacta de max(0, Normal) + tiempo de pago, la variable de control
+    return momentos_tiempo_en_caja(mu_productos, sigma_productos, p_pago_efectivo, tiempo_efectivo,
+                                   tiempo_otro_medio)[0]
+
+
+def generar_desde_uniformes(u, mu_llegadas=gptvale.mu_llegadas, mu_productos=gptvale.mu_productos,
+                            sigma_productos=gptvale.sigma_productos, p_pago_efectivo=gptvale.p_pago_efectivo,
+                            tiempo_efectivo=gptvale.tiempo_efectivo, tiempo_otro_medio=gptvale.tiempo_otro_medio):
+    """
+    Mismo modelo que gptvale.generar_clientes, pero por transformada inversa a partir de
+    uniformes u de forma (..., 3, n), para poder usar variables antitéticas (u y 1 - u).
+    """
+    from scipy.special import ndtri
+    from scipy.stats import poisson
+
+    u = np.clip(u, 1e-12, 1 - 1e-12)  # ppf(0) de Poisson es -1 y ndtri(0) es -inf
+    tiempos_llegada = np.cumsum(poisson.ppf(u[..., 0, :], mu_llegadas), axis=-1)
+    productos = np.maximum(0, mu_productos + sigma_productos * ndtri(u[..., 1, :]))
+    pago_efectivo = u[..., 2, :] < p_pago_efectivo
+    tiempos_pago = np.where(pago_efectivo, tiempo_efectivo, tiempo_otro_medio)
+    return tiempos_llegada, productos + tiempos_pago
+
+
+def comparar_disciplinas(num_replicas, n=gptvale.n, k=gptvale.k, semilla=None, antiteticas=True, control=True,
+                         confianza=0.95, **parametros):
+    """
+    Compara fila única contra filas separadas con números aleatorios comunes: en cada réplica
+    las dos disciplinas atienden exactamente los mismos clientes, y se estima la diferencia
+    de espera media (separadas - única) con su intervalo de confianza.
+    Las dos disciplinas se simulan con el MotorEventos (en filas separadas cada cliente elige
+    la caja con menos gente en ese momento).
+    :param antiteticas: Cada unidad promedia una réplica con u y otra con 1 - u.
+    :param control: Ajustar con la media de tiempo en caja de cada réplica, cuya esperanza se conoce.
+    :return: Diccionario con la diferencia, su semiancho y la reducción de varianza lograda
+             frente a simular las dos disciplinas con números independientes.
+    """
+    rng = np.random.default_rng(semilla)
+    corridas = 2 if antiteticas else 1
+    unidades = max(2, num_replicas // corridas)
+
+    u = rng.random((unidades, 3, n))
+    if antiteticas:
+        u = np.stack((u, 1 - u), axis=1)
+    else:
+        u = u[:, np.newaxis]
+    tiempos_llegada, tiempos_en_caja = generar_desde_uniformes(u, **parametros)
+
+    esperas_unica = np.empty((unidades, corridas))
+    esperas_separadas = np.empty((unidades, corridas))
+    for r in range(unidades):
+        for j in range(corridas):
+            _, espera_unica = simular_fila_unica(n, k, tiempos_llegada[r, j], tiempos_en_caja[r, j])
+            _, espera_separadas = simular_filas_separadas(n, k, tiempos_llegada[r, j], tiempos_en_caja[r, j])
+            esperas_unica[r, j] = espera_unica.mean()
+            esperas_separadas[r, j] = espera_separadas.mean()
+
+    diferencias = (esperas_separadas - esperas_unica).mean(axis=1)
+    if control:
+        controles = tiempos_en_caja.mean(axis=(1, 2))
+        desvio = controles - media_tiempo_en_caja(**parametros)
+        varianza_control = desvio.var(ddof=1)
+        if varianza_control > 0:
+            beta = np.cov(diferencias, controles)[0, 1] / varianza_control
+            diferencias = diferencias - beta * desvio
+
+    media, semiancho = intervalo_confianza(diferencias, confianza)
+    # Varianza por unidad si cada disciplina se simulara con sus propios números aleatorios
+    varianza_independiente = (esperas_unica.var(ddof=1) + esperas_separadas.var(ddof=1)) / corridas
+    varianza_pareada = diferencias.var(ddof=1)
+    return {
+        'replicas': unidades * corridas,
+        'diferencia_media': media,
+        'diferencia_semiancho': semiancho,
+        'espera_unica': esperas_unica.mean(),
+        'espera_separadas': esperas_separadas.mean(),
+        'reduccion_varianza': varianza_independiente / varianza_pareada if varianza_pareada > 0 else math.inf,
+    }
+
+
+if __name__ == "__main__":
+    resultado = comparar_disciplinas(400, semilla=0)
+    print(f"Espera media - Fila única: {resultado['espera_unica']:.2f} min, "
+          f"Filas separadas: {resultado['espera_separadas']:.2f} min")
+    print(f"Diferencia (separadas - única): {resultado['diferencia_media']:.3f} "
+          f"± {resultado['diferencia_semiancho']:.3f} min "
+          f"(varianza {resultado['reduccion_varianza']:.1f} veces menor que con muestras independientes)")
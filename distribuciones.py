@@ -0,0 +1,163 @@
+"""
+Registro de distribuciones para llegadas, productos y medio de pago.
+
+Cada distribución se arma una sola vez (crear guarda las ya armadas) y después muestrea en
+bloque con NumPy. Las discretas usan tablas alias de Walker: armar la tabla es O(m) y cada
+muestra cuesta un entero y un uniforme, sin importar la forma de la distribución, así que una
+distribución empírica (por ejemplo, productos por ticket de los datos de caja) es tan rápida
+como la del modelo.
+
+    productos = crear('normal_truncada_entera', media=5, desviacion=3, minimo=1, maximo=10)
+    productos.muestrear(rng, 1000)
+"""
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from lote_clientes import (DESVIACION_PRODUCTOS, MAXIMO_PRODUCTOS, MEDIA_PRODUCTOS, MINIMO_PRODUCTOS,
+                           MU_LLEGADAS, P_PAGO_EFECTIVO, TIEMPO_EFECTIVO, TIEMPO_OTRO_MEDIO, ClienteBatch)
+
+_RNG = np.random.default_rng()  # Para muestrear sin pasar un generador (los scripts viejos)
+
+
+class TablaAlias:
+    """
+    Distribución discreta sobre valores con las probabilidades dadas, muestreada por el método
+    alias de Walker (armado de Vose).
+    """
+
+    def __init__(self, valores, probabilidades):
+        valores = np.asarray(valores)
+        probabilidades = np.asarray(probabilidades, dtype=float)
+        if len(valores) != len(probabilidades) or len(valores) == 0:
+            raise ValueError("Se necesita una probabilidad por valor")
+        if np.any(probabilidades < 0) or probabilidades.sum() <= 0:
+            raise ValueError("Las probabilidades deben ser no negativas y sumar más que 0")
+        m = len(valores)
+        escaladas = probabilidades * (m / probabilidades.sum())
+        self.valores = valores
+        self.probabilidades = probabilidades / probabilidades.sum()
+        self.umbral = np.ones(m)
+        self.alias = np.arange(m)
+
+        # Cada columna i se queda con su valor con probabilidad umbral[i] y si no toma alias[i]
+        chicas = [i for i in range(m) if escaladas[i] < 1]
+        grandes = [i for i in range(m) if escaladas[i] >= 1]
+        while chicas and grandes:
+            chica, grande = chicas.pop(), grandes.pop()
+            self.umbral[chica] = escaladas[chica]
+            self.alias[chica] = grande
+            escaladas[grande] -= 1 - escaladas[chica]
+            (chicas if escaladas[grande] < 1 else grandes).append(grande)
+        # Lo que queda vale 1 salvo por redondeo
+        for i in chicas + grandes:
+            self.umbral[i] = 1.0
+
+    @classmethod
+    def desde_muestras(cls, datos):
+        # Distribución empírica: cada valor observado con su frecuencia relativa
+        valores, cantidades = np.unique(np.asarray(datos), return_counts=True)
+        return cls(valores, cantidades)
+
+    def muestrear(self, rng=None, n=1):
+        rng = _RNG if rng is None else rng
+        columnas = rng.integers(len(self.valores), size=n)
+        propios = rng.random(n) < self.umbral[columnas]
+        return self.valores[np.where(propios, columnas, self.alias[columnas])]
+
+    def media(self):
+        return float(np.dot(self.valores, self.probabilidades))
+
+
+class Poisson:
+    def __init__(self, media):
+        self.media_poisson = media
+
+    def muestrear(self, rng=None, n=1):
+        return (_RNG if rng is None else rng).poisson(self.media_poisson, n)
+
+    def media(self):
+        return self.media_poisson
+
+
+class Bernoulli:
+    def __init__(self, p):
+        self.p = p
+
+    def muestrear(self, rng=None, n=1):
+        return (_RNG if rng is None else rng).random(n) < self.p
+
+    def media(self):
+        return self.p
+
+
+def normal_truncada_entera(media, desviacion, minimo, maximo):
+    """
+    int() de una normal truncada a [minimo, maximo], como Cliente.generar_productos: el valor j
+    tiene la probabilidad de que la normal truncada caiga en [j, j + 1). Con minimo y maximo
+    enteros, maximo solo sale con probabilidad 0, así que el soporte es minimo..maximo - 1.
+    """
+    def acumulada(x):
+        return 0.5 * (1 + math.erf((x - media) / (desviacion * math.sqrt(2))))
+
+    valores = np.arange(math.floor(minimo), math.ceil(maximo))
+    bordes = np.clip(np.append(valores, valores[-1] + 1), minimo, maximo)
+    probabilidades = np.diff([acumulada(x) for x in bordes])
+    return TablaAlias(valores, probabilidades)
+
+
+DISTRIBUCIONES = {
+    'poisson': Poisson,
+    'bernoulli': Bernoulli,
+    'normal_truncada_entera': normal_truncada_entera,
+    'discreta': TablaAlias,
+    'empirica': TablaAlias.desde_muestras,
+}
+
+
+def registrar(nombre, fabrica):
+    # fabrica(**parametros) debe devolver un objeto con muestrear(rng, n)
+    DISTRIBUCIONES[nombre] = fabrica
+    _crear.cache_clear()
+
+
+def _hasheable(valor):
+    return tuple(_hasheable(v) for v in valor) if isinstance(valor, (list, tuple, np.ndarray)) else valor
+
+
+@lru_cache(maxsize=256)
+def _crear(tipo, parametros):
+    if tipo not in DISTRIBUCIONES:
+        raise ValueError(f"Distribución desconocida: {tipo}")
+    return DISTRIBUCIONES[tipo](**dict(parametros))
+
+
+def crear(tipo, **parametros):
+    """
+    Distribución registrada con esos parámetros. Se arma una vez y se reutiliza; las listas
+    (valores, probabilidades, datos) se aceptan y se comparan por contenido.
+    """
+    return _crear(tipo, tuple(sorted((nombre, _hasheable(valor)) for nombre, valor in parametros.items())))
+
+
+def generar_lote(n, rng=None, llegadas=None, productos=None, pago_efectivo=None,
+                 tiempo_efectivo=TIEMPO_EFECTIVO, tiempo_otro_medio=TIEMPO_OTRO_MEDIO):
+    """
+    Como ClienteBatch.generar, pero con cualquier distribución del registro para cada columna.
+    :param llegadas: Distribución del tiempo entre llegadas (por defecto Poisson(MU_LLEGADAS)).
+    :param productos: Distribución de productos (por defecto la normal truncada entera del modelo).
+    :param pago_efectivo: Distribución de pagar en efectivo (por defecto Bernoulli(P_PAGO_EFECTIVO)).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    llegadas = llegadas or crear('poisson', media=MU_LLEGADAS)
+    productos = productos or crear('normal_truncada_entera', media=MEDIA_PRODUCTOS, desviacion=DESVIACION_PRODUCTOS,
+                                   minimo=MINIMO_PRODUCTOS, maximo=MAXIMO_PRODUCTOS)
+    pago_efectivo = pago_efectivo or crear('bernoulli', p=P_PAGO_EFECTIVO)
+
+    tiempo_llegada = llegadas.muestrear(rng, n)
+    if n:
+        tiempo_llegada[0] = 0  # El primer cliente llega en el minuto 0, como en generar
+    return ClienteBatch(tiempo_llegada, productos.muestrear(rng, n), pago_efectivo.muestrear(rng, n),
+                        tiempo_efectivo, tiempo_otro_medio)
@@ -0,0 +1,97 @@
+"""
+¿Cuántas cajas hacen falta para que la espera media (o el percentil 95) no pase de X minutos?
+
+Se generan una sola vez los clientes de todas las réplicas y se simulan con cada k candidato
+(números aleatorios comunes): las diferencias entre un k y otro se deben a las cajas y no al
+azar, y con fila única la espera de cada réplica nunca aumenta al agregar una caja.
+"""
+import numpy as np
+
+import gptvale
+from motor_eventos import FILA_POR_CAJA, FILA_UNICA
+from replicas import MODELOS, intervalo_confianza, simular_fila_unica_replicas
+
+METRICAS = ('media', 'p95')
+
+
+def _metrica_por_replica(tiempos_espera, metrica):
+    if metrica == 'media':
+        return tiempos_espera.mean(axis=1)
+    return np.percentile(tiempos_espera, 95, axis=1)
+
+
+def evaluar_cajas(k, tiempos_llegada, tiempos_en_caja, metrica='media', disciplina=FILA_UNICA):
+    """
+    Simula con k cajas las réplicas dadas (filas de tiempos_llegada y tiempos_en_caja).
+    :return: Arreglo con la métrica de espera de cada réplica.
+    """
+    if disciplina == FILA_UNICA:
+        _, tiempos_espera = simular_fila_unica_replicas(k, tiempos_llegada, tiempos_en_caja)
+    else:
+        simular = MODELOS[disciplina]
+        n = tiempos_llegada.shape[1]
+        tiempos_espera = np.array([simular(n, k, llegadas, duraciones)[1]
+                                   for llegadas, duraciones in zip(tiempos_llegada, tiempos_en_caja)])
+    return _metrica_por_replica(tiempos_espera, metrica)
+
+
+def minimo_cajas(espera_maxima, metrica='media', num_replicas=200, n=gptvale.n, disciplina=FILA_UNICA,
+                 semilla=None, confianza=0.95, replicas_piloto=20, maximo_cajas=50, **parametros):
+    """
+    Busca el menor k cuya métrica de espera es menor que espera_maxima con la confianza pedida,
+    es decir, con el extremo superior del intervalo por debajo del objetivo.
+    Los k se prueban de menor a mayor. Cada k se simula primero con replicas_piloto réplicas:
+    si el extremo inferior de ese intervalo ya supera el objetivo, el k se descarta sin simular
+    el resto (rechazo temprano). Los k cuyo intervalo completo contiene al objetivo quedan como
+    'dudosa' y la búsqueda sigue.
+    :param metrica: 'media' (espera media de cada réplica) o 'p95' (su percentil 95).
+    :param parametros: Parámetros de gptvale.generar_clientes.
+    :return: Diccionario con 'cajas' (None si ningún k hasta maximo_cajas cumple) y
+             'evaluaciones', una por k probado, con estado, media, semiancho y réplicas usadas.
+    """
+    if metrica not in METRICAS:
+        raise ValueError(f"Métrica inválida: {metrica}")
+    if disciplina not in (FILA_UNICA, FILA_POR_CAJA):
+        raise ValueError(f"Disciplina inválida: {disciplina}")
+    rng = np.random.default_rng(semilla)
+    tiempos_llegada, tiempos_en_caja = gptvale.generar_clientes((num_replicas, n), rng, **parametros)
+    replicas_piloto = min(replicas_piloto, num_replicas)
+
+    evaluaciones = []
+    for k in range(1, maximo_cajas + 1):
+        valores = evaluar_cajas(k, tiempos_llegada[:replicas_piloto], tiempos_en_caja[:replicas_piloto],
+                                metrica, disciplina)
+        media, semiancho = intervalo_confianza(valores, confianza)
+        if media - semiancho > espera_maxima:
+            estado = 'rechazada'
+        else:
+            if replicas_piloto < num_replicas:
+                resto = evaluar_cajas(k, tiempos_llegada[replicas_piloto:], tiempos_en_caja[replicas_piloto:],
+                                      metrica, disciplina)
+                valores = np.concatenate((valores, resto))
+                media, semiancho = intervalo_confianza(valores, confianza)
+            if media + semiancho <= espera_maxima:
+                estado = 'factible'
+            elif media - semiancho > espera_maxima:
+                estado = 'infactible'
+            else:
+                estado = 'dudosa'
+        evaluaciones.append({
+            'k': k,
+            'estado': estado,
+            'media': float(media),
+            'semiancho': float(semiancho),
+            'replicas': len(valores),
+        })
+        if estado == 'factible':
+            return {'cajas': k, 'evaluaciones': evaluaciones}
+    return {'cajas': None, 'evaluaciones': evaluaciones}
+
+
+if __name__ == "__main__":
+    for metrica, objetivo in (('media', 1.0), ('p95', 5.0)):
+        resultado = minimo_cajas(objetivo, metrica, n=1000, semilla=0)
+        print(f"Espera {metrica} < {objetivo} min: {resultado['cajas']} cajas")
+        for evaluacion in resultado['evaluaciones']:
+            print(f"  k={evaluacion['k']}: {evaluacion['estado']:10} {evaluacion['media']:10.3f} "
+                  f"± {evaluacion['semiancho']:.3f} ({evaluacion['replicas']} réplicas)")
@@ -0,0 +1,101 @@
+"""
+Estimación en estado estacionario con una sola corrida larga.
+
+Todas las simulaciones empiezan con las cajas vacías, así que los primeros clientes esperan
+menos que en régimen y sesgan el promedio. En vez de hacer muchas corridas cortas:
+  1. se descarta el período de calentamiento, detectado con MSER-5 sobre las esperas, y
+  2. con lo que queda se calcula la media por lotes no superpuestos y su intervalo de confianza.
+"""
+import numpy as np
+
+from lote_clientes import ClienteBatch
+from motor_eventos import FILA_UNICA, MotorEventos
+from replicas import intervalo_confianza
+
+
+def mser(serie, tamano_lote=5, fraccion_maxima=0.5):
+    """
+    Regla MSER-m (White, 1997): se agrupa la serie en lotes de tamano_lote y se elige el corte d
+    que minimiza la varianza de la media de lo que queda,
+        MSER(d) = sum_{i >= d} (Y_i - media(Y_d:))^2 / (m - d)^2.
+    Solo se consideran cortes en la primera fraccion_maxima de la serie; si el mínimo cae al
+    final de ese rango, la corrida es demasiado corta para salir del transitorio.
+    :return: (cantidad de observaciones a descartar, si el corte es confiable)
+    """
+    serie = np.asarray(serie, dtype=float)
+    m = len(serie) // tamano_lote
+    if m < 2:
+        return 0, False
+    lotes = serie[:m * tamano_lote].reshape(m, tamano_lote).mean(axis=1)
+    lotes = lotes - lotes.mean()  # Centrar mejora la precisión de suma de cuadrados menos cuadrado de la suma
+
+    # Sumas de cada sufijo Y[d:] con cumsum sobre la serie invertida
+    suma = np.cumsum(lotes[::-1])[::-1]
+    suma_cuadrados = np.cumsum((lotes ** 2)[::-1])[::-1]
+    restantes = np.arange(m, 0, -1)
+    cortes = max(int(m * fraccion_maxima), 1)
+    dispersion = suma_cuadrados[:cortes] - suma[:cortes] ** 2 / restantes[:cortes]
+    d = int(np.argmin(dispersion / restantes[:cortes] ** 2))
+    return d * tamano_lote, d < cortes - 1
+
+
+def medias_por_lotes(serie, num_lotes=30, confianza=0.95):
+    """
+    Media por lotes no superpuestos: se parte la serie en num_lotes lotes del mismo tamaño
+    (descartando el resto del principio) y se trata a la media de cada lote como una
+    observación independiente. Si la autocorrelación entre lotes consecutivos es alta, los
+    lotes son chicos para la correlación de la serie y el intervalo queda corto.
+    :return: Diccionario con media, semiancho, tamano_lote, autocorrelacion y las medias.
+    """
+    serie = np.asarray(serie, dtype=float)
+    tamano_lote = len(serie) // num_lotes
+    if tamano_lote == 0:
+        raise ValueError(f"Se necesitan al menos {num_lotes} observaciones para {num_lotes} lotes")
+    medias = serie[len(serie) - tamano_lote * num_lotes:].reshape(num_lotes, tamano_lote).mean(axis=1)
+    media, semiancho = intervalo_confianza(medias, confianza)
+    centradas = medias - medias.mean()
+    denominador = (centradas ** 2).sum()
+    autocorrelacion = float((centradas[:-1] * centradas[1:]).sum() / denominador) if denominador > 0 else 0.0
+    return {
+        'media': media,
+        'semiancho': semiancho,
+        'tamano_lote': tamano_lote,
+        'autocorrelacion': autocorrelacion,
+        'medias': medias,
+    }
+
+
+def estimar_estacionario(esperas, num_lotes=30, confianza=0.95, tamano_lote_mser=5):
+    """
+    Descarta el calentamiento con MSER y estima la espera media en régimen por lotes.
+    :param esperas: Tiempos de espera en orden de llegada de una corrida larga.
+    :return: Diccionario de medias_por_lotes con 'descartados', 'corte_confiable' y 'media_sin_corte'.
+    """
+    esperas = np.asarray(esperas, dtype=float)
+    descartados, confiable = mser(esperas, tamano_lote_mser)
+    resultado = medias_por_lotes(esperas[descartados:], num_lotes, confianza)
+    resultado['descartados'] = descartados
+    resultado['corte_confiable'] = confiable
+    resultado['media_sin_corte'] = float(esperas.mean())
+    return resultado
+
+
+def simular_estacionario(num_cajas, num_clientes, disciplina=FILA_UNICA, rng=None, num_lotes=30,
+                         confianza=0.95, **parametros):
+    """
+    Una corrida larga del MotorEventos y su estimación en estado estacionario.
+    :param parametros: Parámetros de ClienteBatch.generar.
+    """
+    lote = ClienteBatch.generar(num_clientes, rng=rng, **parametros)
+    motor = MotorEventos(num_cajas, lote.tiempos_llegada, lote.tiempos_en_caja, disciplina).ejecutar()
+    return estimar_estacionario(motor.tiempos_espera, num_lotes, confianza)
+
+
+if __name__ == "__main__":
+    resultado = simular_estacionario(3, 200_000, rng=np.random.default_rng(0))
+    print(f"Clientes descartados por calentamiento: {resultado['descartados']}"
+          f"{'' if resultado['corte_confiable'] else ' (la corrida no alcanzó el régimen)'}")
+    print(f"Espera media en régimen: {resultado['media']:.3f} ± {resultado['semiancho']:.3f} min "
+          f"({len(resultado['medias'])} lotes de {resultado['tamano_lote']}, "
+          f"autocorrelación {resultado['autocorrelacion']:.2f})")
+    print(f"Espera media sin descartar: {resultado['media_sin_corte']:.3f} min")
@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+
+
+class Acumulador:
+    """
+    Estadísticas en línea (Welford): cantidad, media, varianza, mínimo y máximo en memoria constante.
+    Dos acumuladores de distintas partes de una corrida se pueden combinar sin perder precisión.
+    """
+
+    def __init__(self):
+        self.cantidad = 0
+        self.media = 0.0
+        self.m2 = 0.0  # Suma de cuadrados de las diferencias con la media
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def agregar(self, x):
+        self.cantidad += 1
+        delta = x - self.media
+        self.media += delta / self.cantidad
+        self.m2 += delta * (x - self.media)
+        if x < self.minimo:
+            self.minimo = x
+        if x > self.maximo:
+            self.maximo = x
+
+    def agregar_lote(self, valores):
+        # Resumir el lote con NumPy y combinarlo, en vez de agregar valor por valor
+        valores = np.asarray(valores, dtype=float)
+        if valores.size == 0:
+            return
+        lote = Acumulador()
+        lote.cantidad = valores.size
+        lote.media = float(valores.mean())
+        lote.m2 = float(((valores - lote.media) ** 2).sum())
+        lote.minimo = float(valores.min())
+        lote.maximo = float(valores.max())
+        self.combinar(lote)
+
+    def combinar(self, otro):
+        # Fórmula de Chan et al. para unir dos resúmenes
+        if otro.cantidad == 0:
+            return self
+        if self.cantidad == 0:
+            self.cantidad, self.media, self.m2 = otro.cantidad, otro.media, otro.m2
+            self.minimo, self.maximo = otro.minimo, otro.maximo
+            return self
+        cantidad = self.cantidad + otro.cantidad
+        delta = otro.media - self.media
+        self.media += delta * otro.cantidad / cantidad
+        self.m2 += otro.m2 + delta * delta * self.cantidad * otro.cantidad / cantidad
+        self.cantidad = cantidad
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        return self
+
+    @classmethod
+    def combinar_todos(cls, acumuladores):
+        total = cls()
+        for acumulador in acumuladores:
+            total.combinar(acumulador)
+        return total
+
+    @property
+    def total(self):
+        return self.media * self.cantidad
+
+    def varianza(self, ddof=0):
+        # ddof=0 por defecto, igual que np.std en los scripts
+        if self.cantidad - ddof <= 0:
+            return math.nan
+        return self.m2 / (self.cantidad - ddof)
+
+    def desviacion(self, ddof=0):
+        return math.sqrt(self.varianza(ddof))
+
+    def __str__(self):
+        return (
+            f"n={self.cantidad}, media={self.media:.2f}, desviación={self.desviacion():.2f}, "
+            f"mín={self.minimo:.2f}, máx={self.maximo:.2f}"
+        )
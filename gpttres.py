@@ -1,28 +1,37 @@
 import random
 import numpy as np
 from collections import Counter
-from scipy.stats import truncnorm
-import matplotlib.pyplot as plt
+from distribuciones import crear
+from lote_clientes import ClienteBatch, atender_en_caja
+from estadisticas import Acumulador
+from motor_eventos import FILA_POR_CAJA, MotorEventos
+from perfilado import PERFILADOR_INACTIVO, Perfilador
 
 # Variable global para el tiempo
 tiempo = 0
 
 # Definir clase Cliente
 class Cliente:
-    def __init__(self, id, tiempo_llegada, tiempo_llegada_acumulado):
+    # Sin __dict__ por cliente; para muchos clientes conviene ClienteBatch.cliente(i), que no copia nada
+    __slots__ = ('id', 'tiempo_llegada', 'tiempo_llegada_acumulado', 'productos', 'pago_efectivo',
+                 'tiempo_pago', 'tiempo_total', 'tiempo_espera')
+
+    def __init__(self, id, tiempo_llegada, tiempo_llegada_acumulado, productos=None, pago_efectivo=None):
         self.id = id
         self.tiempo_llegada = tiempo_llegada  # Tiempo de llegada predefinido según Poisson
         self.tiempo_llegada_acumulado = tiempo_llegada_acumulado
-        self.productos = self.generar_productos()  # Llama a función que define número de productos
-        self.pago_efectivo = random.random() < 0.4  # Pago en efectivo (Bernoulli con probabilidad de 0.4)
+        # Si vienen de un ClienteBatch se usan esos valores, si no se sortean acá
+        self.productos = self.generar_productos() if productos is None else productos  # Número de productos
+        self.pago_efectivo = random.random() < 0.4 if pago_efectivo is None else pago_efectivo  # Pago en efectivo (Bernoulli con probabilidad de 0.4)
         self.tiempo_pago = 2 if self.pago_efectivo else 70 / 60  # Tiempo de pago en minutos dependiendo del método
         self.tiempo_total = self.productos + self.tiempo_pago  # Tiempo total en la caja
         self.tiempo_espera = 0  # Tiempo de espera en la fila
 
     # Función que define número de productos según Distribución normal truncada
     def generar_productos(self, media=5, desviacion=3, minimo=1, maximo=10):
-        a, b = (minimo - media) / desviacion, (maximo - media) / desviacion 
-        return int(truncnorm.rvs(a, b, loc=media, scale=desviacion))
+        # Tabla alias armada una sola vez por juego de parámetros; ya incluye el int()
+        distribucion = crear('normal_truncada_entera', media=media, desviacion=desviacion, minimo=minimo, maximo=maximo)
+        return int(distribucion.muestrear()[0])
 
     def __str__(self):
         tipo_pago = "Efectivo" if self.pago_efectivo else "Otro medio"
@@ -37,7 +46,12 @@ class Cliente:
 class Caja:
     def __init__(self, id):
         self.id = id
-        self.clientes_en_cola = []
+        self.num_atendidos = 0
+        # Los clientes atendidos en lote no se guardan como objetos: quedan el lote y sus índices
+        # (un range con fila única, un arreglo con fila por caja)
+        self.lote = None
+        self.indices = range(0)
+        self.esperas = Acumulador()  # Estadísticas de espera de los clientes de esta caja
         self.tiempo_total_espera = 0
         self.tiempo_total_activa = 0
         self.tiempo_inactivo = 0
@@ -46,7 +60,7 @@ class Caja:
     # Agregar cliente a cola
     def atender_cliente(self, cliente):
         global tiempo
-        if self.clientes_en_cola:
+        if self.num_atendidos:
             # El cliente debe esperar hasta que termine el último cliente
             tiempo_disponible = self.tiempo_fin_ultima_atencion  
         else:
@@ -54,6 +68,7 @@ class Caja:
 
         cliente.tiempo_espera = max(0, tiempo_disponible - cliente.tiempo_llegada_acumulado)
         self.tiempo_total_espera += cliente.tiempo_espera
+        self.esperas.agregar(cliente.tiempo_espera)
         
         tiempo_fin = cliente.tiempo_llegada_acumulado + cliente.tiempo_espera + cliente.tiempo_total
         self.tiempo_total_activa += cliente.tiempo_total
@@ -63,10 +78,45 @@ class Caja:
             self.tiempo_inactivo += max(0, cliente.tiempo_llegada_acumulado - self.tiempo_fin_ultima_atencion)
 
         self.tiempo_fin_ultima_atencion = tiempo_fin  # Actualizamos el tiempo de fin de la atención
-        self.clientes_en_cola.append(cliente)
+        self.num_atendidos += 1
+
+    # Atender de una vez los clientes de un ClienteBatch indicados por indices, sin crear objetos Cliente
+    def atender_lote(self, lote, indices):
+        espera, activa, inactivo, fin = atender_en_caja(lote, indices, self.tiempo_fin_ultima_atencion)
+        self.tiempo_total_espera += espera
+        self.tiempo_total_activa += activa
+        self.tiempo_inactivo += inactivo
+        self.tiempo_fin_ultima_atencion = fin
+        self.esperas.agregar_lote(lote.tiempo_espera[indices])
+        self.num_atendidos += len(indices)
+        self._guardar_indices(lote, indices)
+
+    # Tomar los resultados de esta caja de una simulación del MotorEventos
+    def cargar_motor(self, motor, lote):
+        c = self.id - 1
+        self.tiempo_total_espera += motor.espera_por_caja[c]
+        self.tiempo_total_activa += motor.tiempo_activa[c]
+        self.tiempo_inactivo += motor.tiempo_inactivo[c]
+        self.tiempo_fin_ultima_atencion = motor.tiempo_fin[c]
+        indices = np.flatnonzero(motor.caja_asignada == c)
+        self.esperas.agregar_lote(lote.tiempo_espera[indices])
+        self.num_atendidos += motor.atendidos[c]
+        self._guardar_indices(lote, indices)
+
+    def _guardar_indices(self, lote, indices):
+        if len(self.indices) == 0:
+            self.lote, self.indices = lote, indices
+        elif self.lote is lote:
+            self.indices = np.concatenate((self.indices, indices))
+        else:
+            raise ValueError("Una caja solo guarda los índices de un lote")
+
+    # Clientes atendidos en lote, como vistas sobre las columnas del lote
+    def clientes(self):
+        return iter(()) if self.lote is None else self.lote.clientes(self.indices)
 
     def num_clientes_en_cola(self):
-        return len(self.clientes_en_cola)
+        return self.num_atendidos
 
     def __str__(self):
         return f"Caja {self.id}: Clientes en Cola={self.num_clientes_en_cola()}"
@@ -76,22 +126,11 @@ def seleccionar_caja(cajas):
     return min(cajas, key=lambda caja: caja.num_clientes_en_cola())
 
 # Función para atender clientes con fila única
-def atender_clientes_unica_fila(cajas, clientes):
-    global tiempo
-    for cliente in clientes:
-        # Seleccionar la caja con menos clientes
-        caja_seleccionada = seleccionar_caja(cajas)
-        caja_seleccionada.atender_cliente(cliente)
-
-# Ingreso de opciones
-opcion = ""
-num_cajas = 3
-num_clientes = 100
-
-while opcion not in ['1', '2']:
-    opcion = input("Por favor, elige una opción:\n1 - Fila única para todas las cajas\n2 - Fila distinta por cada caja\nOpción: ")
-    if opcion not in ['1', '2']:
-        print("\nError: opción inválida\n")
+def atender_clientes_unica_fila(cajas, lote):
+    # seleccionar_caja elige la caja con menos clientes, así que el cliente i termina en la
+    # caja i % len(cajas): cada caja atiende su parte del lote de una sola vez
+    for caja in cajas:
+        caja.atender_lote(lote, range(caja.id - 1, len(lote), len(cajas)))
 
 def ingresar_num_cajas_positivo():
     while True:
@@ -105,8 +144,6 @@ def ingresar_num_cajas_positivo():
         except ValueError:
             print("Error: Debes ingresar un número válido, se asignará el valor default 3")
             return 3
-        
-num_cajas = ingresar_num_cajas_positivo()
 
 def ingresar_numero_positivo():
     while True:
@@ -121,106 +158,143 @@ def ingresar_numero_positivo():
             print("Error: Debes ingresar un número válido, se asignará el valor default 100")
             return 100
 
-# Uso de la función
-num_clientes = ingresar_numero_positivo()
+# Simulación sin interacción: crea las cajas, genera y atiende a los clientes
+def simular(num_cajas, num_clientes, opcion='1', rng=None, perfilador=PERFILADOR_INACTIVO):
+    global tiempo
+    # Crear lista de cajas
+    cajas = [Caja(i) for i in range(1, num_cajas + 1)]
+
+    # Generar todos los clientes de una vez (llegadas según Poisson con media 3)
+    with perfilador.fase('generacion'):
+        lote = ClienteBatch.generar(num_clientes, mu_llegadas=3, rng=rng)
+    perfilador.contar('clientes_generados', len(lote))
+    perfilador.contar('muestras', 3 * len(lote))  # Llegada, productos y medio de pago
+
+    # Atender clientes
+    if opcion == '1':
+        with perfilador.fase('atencion'):
+            atender_clientes_unica_fila(cajas, lote)
+    else:
+        # Fila por caja: cada cliente elige la caja con menos gente en el momento en que llega
+        # (seleccionar_caja cuenta a todos los atendidos, no a los que están en la caja)
+        motor = MotorEventos(num_cajas, lote.tiempos_llegada, lote.tiempos_en_caja, FILA_POR_CAJA,
+                             perfilador=perfilador).ejecutar()
+        with perfilador.fase('estadisticas'):
+            lote.tiempo_espera[:] = motor.tiempos_espera
+            for caja in cajas:
+                caja.cargar_motor(motor, lote)
+
+    with perfilador.fase('estadisticas'):
+        # Actualizar el tiempo total de la simulación después de atender todos los clientes
+        tiempo = max(caja.tiempo_fin_ultima_atencion for caja in cajas)
+
+        # Calcular tiempo inactivo para cada caja
+        for caja in cajas:
+            if caja.num_clientes_en_cola() == 0:
+                # Si la caja no tuvo clientes, estuvo inactiva todo el tiempo de simulación
+                caja.tiempo_inactivo = tiempo
+            else:
+                # Tiempo inactivo desde el último cliente atendido hasta el final de la simulación
+                caja.tiempo_inactivo += max(0, tiempo - caja.tiempo_fin_ultima_atencion)
 
-# Crear lista de cajas
-cajas = [Caja(i) for i in range(1, num_cajas + 1)]
+    return cajas, lote
 
-# Generar tiempos de llegada según distribución de Poisson
-clientes = []
-llegada_acumulada = 0
-for i in range(num_clientes):
-    variable_poisson = np.random.poisson(3)
-    if i != 0:
-        llegada_acumulada += variable_poisson  # El tiempo de llegada está dado por una Poisson con media 3
-        llegada = variable_poisson
-    else:
-        llegada = 0
-    
-    cliente = Cliente(id=i + 1, tiempo_llegada=llegada, tiempo_llegada_acumulado=llegada_acumulada)
-    clientes.append(cliente)
-
-# Atender clientes
-if opcion == '1':
-    atender_clientes_unica_fila(cajas, clientes)
-else:
-    for cliente in clientes:
-        caja = seleccionar_caja(cajas)
-        caja.atender_cliente(cliente)
-
-# Actualizar el tiempo total de la simulación después de atender todos los clientes
-tiempo = max(caja.tiempo_fin_ultima_atencion for caja in cajas)
-
-# Calcular tiempo inactivo para cada caja
-for caja in cajas:
-    if caja.num_clientes_en_cola() == 0:
-        # Si la caja no tuvo clientes, estuvo inactiva todo el tiempo de simulación
-        caja.tiempo_inactivo = tiempo
+if __name__ == "__main__":
+    import sys
+    import matplotlib.pyplot as plt
+    from reportes import dibujar_resumen, resumir
+
+    # Con --perfil se imprime al final cuánto tardó cada fase
+    perfilador = Perfilador() if '--perfil' in sys.argv[1:] else PERFILADOR_INACTIVO
+    # Con --grafico ARCHIVO (.png o .svg) se guarda un gráfico agregado en vez de mostrar uno por cliente
+    ruta_grafico = sys.argv[sys.argv.index('--grafico') + 1] if '--grafico' in sys.argv[1:-1] else None
+
+    # Ingreso de opciones
+    opcion = ""
+    num_cajas = 3
+    num_clientes = 100
+
+    while opcion not in ['1', '2']:
+        opcion = input("Por favor, elige una opción:\n1 - Fila única para todas las cajas\n2 - Fila distinta por cada caja\nOpción: ")
+        if opcion not in ['1', '2']:
+            print("\nError: opción inválida\n")
+
+    num_cajas = ingresar_num_cajas_positivo()
+    num_clientes = ingresar_numero_positivo()
+
+    cajas, lote = simular(num_cajas, num_clientes, opcion, perfilador=perfilador)
+
+    if ruta_grafico:
+        with perfilador.fase('graficos'):
+            resumen = resumir(lote.tiempos_llegada, lote.tiempo_espera, [caja.tiempo_total_activa for caja in cajas])
+            dibujar_resumen(resumen, ruta_grafico)
     else:
-        # Tiempo inactivo desde el último cliente atendido hasta el final de la simulación
-        caja.tiempo_inactivo += max(0, tiempo - caja.tiempo_fin_ultima_atencion)
-
-# Gráfica de tiempo de uso de cada caja
-tiempos_activas = [caja.tiempo_total_activa for caja in cajas]
-tiempos_inactivos = [caja.tiempo_inactivo for caja in cajas]
-cajas_ids = [caja.id for caja in cajas]
-
-plt.figure(figsize=(15, 5))
-
-# Gráfico de tiempos activos de cada caja
-plt.subplot(1, 3, 1)
-plt.bar(cajas_ids, tiempos_activas, color='blue')
-plt.xlabel('Cajas')
-plt.ylabel('Tiempo Activo (min)')
-plt.title('Tiempo Activo de Cada Caja')
-plt.xticks(cajas_ids)
-
-# Gráfica de tiempos de espera de cada cliente (scatter plot)
-tiempos_espera_clientes = [cliente.tiempo_espera for cliente in clientes]
-ids_clientes = [cliente.id for cliente in clientes]
-
-plt.subplot(1, 3, 2)
-plt.scatter(ids_clientes, tiempos_espera_clientes, color='green', edgecolor='black')
-plt.xlabel('ID Cliente')
-plt.ylabel('Tiempo de Espera (min)')
-plt.title('Tiempo de Espera de los Clientes')
-plt.xticks(range(1, len(clientes) + 1, 10))  # Mostrar ID de cliente cada 10
-
-# Gráfica de tiempos de llegada de los clientes
-tiempos_llegada_clientes = [cliente.tiempo_llegada for cliente in clientes]
-
-plt.subplot(1, 3, 3)
-plt.scatter(ids_clientes, tiempos_llegada_clientes, color='orange', edgecolor='black')
-plt.xlabel('ID Cliente')
-plt.ylabel('Tiempo de Llegada (min)')
-plt.title('Tiempo de Llegada de los Clientes')
-plt.xticks(range(1, len(clientes) + 1, 10))  # Mostrar ID de cliente cada 10
-
-plt.tight_layout()
-plt.show()
-
-# Cálculo de estadísticas
-tiempos_uso_cajas = [caja.tiempo_total_activa for caja in cajas]
-tiempos_espera_clientes = [cliente.tiempo_espera for cliente in clientes]
-
-media_tiempos_uso = np.mean(tiempos_uso_cajas)
-desviacion_tiempos_uso = np.std(tiempos_uso_cajas)
-
-media_tiempos_espera = np.mean(tiempos_espera_clientes)
-desviacion_tiempos_espera = np.std(tiempos_espera_clientes)
-
-# Impresión de resultados
-print("\nResultados:")
-for caja in cajas:
-    print(caja)
-    print(f"Tiempo total de espera en la caja: {caja.tiempo_total_espera:.2f} min")
-    print(f"Tiempo total inactivo de la caja: {caja.tiempo_inactivo:.2f} min")
-
-print(f"\nTiempo total de la simulación: {tiempo:.2f} min")
-
-# Mostrar estadísticas
-print(f"\nValor medio del tiempo de uso de las cajas: {media_tiempos_uso:.2f} min")
-print(f"Desviación estándar del tiempo de uso de las cajas: {desviacion_tiempos_uso:.2f} min")
-print(f"Valor medio del tiempo de espera de los clientes: {media_tiempos_espera:.2f} min")
-print(f"Desviación estándar del tiempo de espera de los clientes: {desviacion_tiempos_espera:.2f} min")
\ No newline at end of file
+        with perfilador.fase('graficos'):
+            # Gráfica de tiempo de uso de cada caja
+            tiempos_activas = [caja.tiempo_total_activa for caja in cajas]
+            tiempos_inactivos = [caja.tiempo_inactivo for caja in cajas]
+            cajas_ids = [caja.id for caja in cajas]
+
+            plt.figure(figsize=(15, 5))
+
+            # Gráfico de tiempos activos de cada caja
+            plt.subplot(1, 3, 1)
+            plt.bar(cajas_ids, tiempos_activas, color='blue')
+            plt.xlabel('Cajas')
+            plt.ylabel('Tiempo Activo (min)')
+            plt.title('Tiempo Activo de Cada Caja')
+            plt.xticks(cajas_ids)
+
+            # Gráfica de tiempos de espera de cada cliente (scatter plot)
+            tiempos_espera_clientes = lote.tiempo_espera
+            ids_clientes = lote.id
+
+            plt.subplot(1, 3, 2)
+            plt.scatter(ids_clientes, tiempos_espera_clientes, color='green', edgecolor='black')
+            plt.xlabel('ID Cliente')
+            plt.ylabel('Tiempo de Espera (min)')
+            plt.title('Tiempo de Espera de los Clientes')
+            plt.xticks(range(1, len(lote) + 1, 10))  # Mostrar ID de cliente cada 10
+
+            # Gráfica de tiempos de llegada de los clientes
+            tiempos_llegada_clientes = lote.tiempo_llegada
+
+            plt.subplot(1, 3, 3)
+            plt.scatter(ids_clientes, tiempos_llegada_clientes, color='orange', edgecolor='black')
+            plt.xlabel('ID Cliente')
+            plt.ylabel('Tiempo de Llegada (min)')
+            plt.title('Tiempo de Llegada de los Clientes')
+            plt.xticks(range(1, len(lote) + 1, 10))  # Mostrar ID de cliente cada 10
+
+            plt.tight_layout()
+        plt.show()
+
+    with perfilador.fase('estadisticas'):
+        # Cálculo de estadísticas (las esperas se combinan desde los acumuladores de cada caja)
+        tiempos_uso_cajas = [caja.tiempo_total_activa for caja in cajas]
+        esperas = Acumulador.combinar_todos(caja.esperas for caja in cajas)
+
+        media_tiempos_uso = np.mean(tiempos_uso_cajas)
+        desviacion_tiempos_uso = np.std(tiempos_uso_cajas)
+
+        media_tiempos_espera = esperas.media
+        desviacion_tiempos_espera = esperas.desviacion()
+
+    # Impresión de resultados
+    print("\nResultados:")
+    for caja in cajas:
+        print(caja)
+        print(f"Tiempo total de espera en la caja: {caja.tiempo_total_espera:.2f} min")
+        print(f"Tiempo total inactivo de la caja: {caja.tiempo_inactivo:.2f} min")
+
+    print(f"\nTiempo total de la simulación: {tiempo:.2f} min")
+
+    # Mostrar estadísticas
+    print(f"\nValor medio del tiempo de uso de las cajas: {media_tiempos_uso:.2f} min")
+    print(f"Desviación estándar del tiempo de uso de las cajas: {desviacion_tiempos_uso:.2f} min")
+    print(f"Valor medio del tiempo de espera de los clientes: {media_tiempos_espera:.2f} min")
+    print(f"Desviación estándar del tiempo de espera de los clientes: {desviacion_tiempos_espera:.2f} min")
+
+    if perfilador.activo:
+        print("\nPerfil de la corrida:")
+        print(perfilador.reporte())
@@ -1,6 +1,6 @@
+from collections import deque
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import bernoulli, norm, poisson
 
 # Parámetros iniciales
 n = 100  # Número de clientes
@@ -12,20 +12,24 @@ p_pago_efectivo = 0.4  # Probabilidad de pagar en efectivo
 tiempo_efectivo = 2  # Tiempo en minutos si paga en efectivo
 tiempo_otro_medio = 70 / 60  # Tiempo en minutos si paga con otro medio
 
-# Simular los tiempos entre llegadas (Poisson)
-tiempos_llegada = np.cumsum(poisson(mu_llegadas).rvs(n))
+def generar_clientes(n, rng, mu_llegadas=mu_llegadas, mu_productos=mu_productos, sigma_productos=sigma_productos,
+                     p_pago_efectivo=p_pago_efectivo, tiempo_efectivo=tiempo_efectivo,
+                     tiempo_otro_medio=tiempo_otro_medio):
+    # Simular los tiempos entre llegadas (Poisson); n puede ser una forma (réplicas, clientes)
+    tiempos_llegada = np.cumsum(rng.poisson(mu_llegadas, n), axis=-1)
 
-# Simular el número de productos de cada cliente (Normal)
-productos = np.maximum(0, norm(mu_productos, sigma_productos).rvs(n))  # Asegurar que sea mayor que 0
+    # Simular el número de productos de cada cliente (Normal)
+    productos = np.maximum(0, rng.normal(mu_productos, sigma_productos, n))  # Asegurar que sea mayor que 0
 
-# Simular si pagan en efectivo o no (Bernoulli)
-pago_efectivo = bernoulli(p_pago_efectivo).rvs(n)
+    # Simular si pagan en efectivo o no (Bernoulli)
+    pago_efectivo = rng.random(n) < p_pago_efectivo
 
-# Asignar tiempos de pago
-tiempos_pago = np.where(pago_efectivo == 1, tiempo_efectivo, tiempo_otro_medio)
+    # Asignar tiempos de pago
+    tiempos_pago = np.where(pago_efectivo, tiempo_efectivo, tiempo_otro_medio)
 
-# Tiempo total que pasa cada cliente en la caja
-tiempos_en_caja = productos + tiempos_pago
+    # Tiempo total que pasa cada cliente en la caja
+    tiempos_en_caja = productos + tiempos_pago
+    return tiempos_llegada, tiempos_en_caja
 
 def simular_fila_unica(n, k, tiempos_llegada, tiempos_en_caja):
     # Inicializar las cajas (tiempo disponible)
@@ -47,62 +51,75 @@ def simular_fila_unica(n, k, tiempos_llegada, tiempos_en_caja):
 def simular_filas_separadas(n, k, tiempos_llegada, tiempos_en_caja):
     tiempo_cajas = np.zeros(k)
     tiempos_espera = np.zeros(n)
+    salidas = [deque() for _ in range(k)]  # Momentos de salida de los clientes que están en cada caja
 
     for i in range(n):
-        # Encontrar la caja con menos personas en la fila
-        caja = np.argmin(tiempo_cajas)
-        
+        # Sacar de cada caja a los clientes que ya se fueron cuando llega este
+        for cola in salidas:
+            while cola and cola[0] <= tiempos_llegada[i]:
+                cola.popleft()
+
+        # Encontrar la caja con menos personas en la fila (la versión en O(log k) está en motor_eventos.py)
+        caja = np.argmin([len(cola) for cola in salidas])
+
         if tiempo_cajas[caja] > tiempos_llegada[i]:
             tiempos_espera[i] = tiempo_cajas[caja] - tiempos_llegada[i]
 
         # Asignar al cliente a la caja y actualizar el tiempo
         tiempo_cajas[caja] = max(tiempos_llegada[i], tiempo_cajas[caja]) + tiempos_en_caja[i]
+        salidas[caja].append(tiempo_cajas[caja])
 
     return tiempo_cajas, tiempos_espera
 
-# Simulación fila única
-tiempo_cajas_unica, tiempos_espera_unica = simular_fila_unica(n, k, tiempos_llegada, tiempos_en_caja)
-
-# Simulación filas separadas
-tiempo_cajas_separadas, tiempos_espera_separadas = simular_filas_separadas(n, k, tiempos_llegada, tiempos_en_caja)
-
-# Graficar tiempo de uso de cada caja
-plt.figure(figsize=(10, 6))
-plt.bar(range(k), tiempo_cajas_unica, color='blue', alpha=0.6, label='Fila Única')
-plt.bar(range(k), tiempo_cajas_separadas, color='green', alpha=0.6, label='Filas Separadas')
-plt.title('Tiempo de uso de cada caja')
-plt.xlabel('Caja')
-plt.ylabel('Tiempo (min)')
-plt.legend()
-plt.show()
-
-# Graficar tiempo de espera
-plt.figure(figsize=(10, 6))
-plt.hist(tiempos_espera_unica, bins=30, alpha=0.6, color='blue', label='Fila Única')
-plt.hist(tiempos_espera_separadas, bins=30, alpha=0.6, color='green', label='Filas Separadas')
-plt.title('Tiempo de espera en la fila')
-plt.xlabel('Tiempo de espera (min)')
-plt.ylabel('Frecuencia')
-plt.legend()
-plt.show()
-
-# Promedio y desviación estándar de tiempo de uso de cada caja
-media_uso_unica = np.mean(tiempo_cajas_unica)
-desviacion_uso_unica = np.std(tiempo_cajas_unica)
-
-media_uso_separadas = np.mean(tiempo_cajas_separadas)
-desviacion_uso_separadas = np.std(tiempo_cajas_separadas)
-
-# Promedio y desviación estándar de tiempo de espera
-media_espera_unica = np.mean(tiempos_espera_unica)
-desviacion_espera_unica = np.std(tiempos_espera_unica)
-
-media_espera_separadas = np.mean(tiempos_espera_separadas)
-desviacion_espera_separadas = np.std(tiempos_espera_separadas)
-
-# Tiempo libre de las cajas (tiempo total menos tiempo usado)
-tiempo_libre_unica = max(tiempo_cajas_unica) - tiempo_cajas_unica
-tiempo_libre_separadas = max(tiempo_cajas_separadas) - tiempo_cajas_separadas
-
-print(f'Tiempo libre de las cajas - Fila única: {tiempo_libre_unica}')
-print(f'Tiempo libre de las cajas - Filas separadas: {tiempo_libre_separadas}')
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    tiempos_llegada, tiempos_en_caja = generar_clientes(n, np.random.default_rng())
+
+    # Simulación fila única
+    tiempo_cajas_unica, tiempos_espera_unica = simular_fila_unica(n, k, tiempos_llegada, tiempos_en_caja)
+
+    # Simulación filas separadas
+    tiempo_cajas_separadas, tiempos_espera_separadas = simular_filas_separadas(n, k, tiempos_llegada, tiempos_en_caja)
+
+    # Graficar tiempo de uso de cada caja
+    plt.figure(figsize=(10, 6))
+    plt.bar(range(k), tiempo_cajas_unica, color='blue', alpha=0.6, label='Fila Única')
+    plt.bar(range(k), tiempo_cajas_separadas, color='green', alpha=0.6, label='Filas Separadas')
+    plt.title('Tiempo de uso de cada caja')
+    plt.xlabel('Caja')
+    plt.ylabel('Tiempo (min)')
+    plt.legend()
+    plt.show()
+
+    # Graficar tiempo de espera
+    plt.figure(figsize=(10, 6))
+    plt.hist(tiempos_espera_unica, bins=30, alpha=0.6, color='blue', label='Fila Única')
+    plt.hist(tiempos_espera_separadas, bins=30, alpha=0.6, color='green', label='Filas Separadas')
+    plt.title('Tiempo de espera en la fila')
+    plt.xlabel('Tiempo de espera (min)')
+    plt.ylabel('Frecuencia')
+    plt.legend()
+    plt.show()
+
+    # Promedio y desviación estándar de tiempo de uso de cada caja
+    media_uso_unica = np.mean(tiempo_cajas_unica)
+    desviacion_uso_unica = np.std(tiempo_cajas_unica)
+
+    media_uso_separadas = np.mean(tiempo_cajas_separadas)
+    desviacion_uso_separadas = np.std(tiempo_cajas_separadas)
+
+    # Promedio y desviación estándar de tiempo de espera
+    media_espera_unica = np.mean(tiempos_espera_unica)
+    desviacion_espera_unica = np.std(tiempos_espera_unica)
+
+    media_espera_separadas = np.mean(tiempos_espera_separadas)
+    desviacion_espera_separadas = np.std(tiempos_espera_separadas)
+
+    # Tiempo libre de las cajas (tiempo total menos tiempo usado)
+    tiempo_libre_unica = max(tiempo_cajas_unica) - tiempo_cajas_unica
+    tiempo_libre_separadas = max(tiempo_cajas_separadas) - tiempo_cajas_separadas
+
+    print(f'Tiempo libre de las cajas - Fila única: {tiempo_libre_unica}')
+    print(f'Tiempo libre de las cajas - Filas separadas: {tiempo_libre_separadas}')
+
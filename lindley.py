@@ -0,0 +1,142 @@
+"""
+Recursión de Lindley resuelta como un scan, sin recorrer los clientes en Python.
+
+Con una caja, fin_i = max(llegada_i, fin_{i-1}) + duracion_i es una composición asociativa en
+el álgebra max-plus. Con C_i = duracion_1 + ... + duracion_i y P_i = C_i - duracion_i,
+    fin_i = C_i + max(fin_0, max_{j <= i} (llegada_j - P_j)),
+que son un cumsum y un maximum.accumulate. Cada trozo de la corrida se resume en tres números
+(suma de llegadas, suma de duraciones y el máximo de llegada_j - P_j), y los resúmenes se
+componen en orden; eso permite procesar los trozos en paralelo en dos pasadas.
+
+Con k cajas y fila única (la primera que se libera atiende) la recursión necesita ordenar las
+cargas y deja de ser max-plus lineal. Sí lo es con reparto cíclico (el cliente i va a la caja
+i mod k, como la opción 1 de gpttres.py): la matriz max-plus es diagonal por bloques y cada
+caja es una recursión de una caja sobre sus clientes.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import gptvale
+from estadisticas import Acumulador
+
+
+def lindley(tiempos_llegada, tiempos_en_caja, fin_anterior=0.0):
+    """
+    Una caja, en orden de llegada.
+    :param fin_anterior: Momento en que la caja termina con los clientes anteriores.
+    :return: (tiempos_espera, fin de la última atención)
+    """
+    tiempos_llegada = np.asarray(tiempos_llegada, dtype=float)
+    tiempos_en_caja = np.asarray(tiempos_en_caja, dtype=float)
+    if tiempos_llegada.size == 0:
+        return np.zeros(0), fin_anterior
+    acumulado = np.cumsum(tiempos_en_caja)
+    previo = acumulado - tiempos_en_caja  # P_i
+    inicio_cadena = np.maximum.accumulate(np.maximum(tiempos_llegada - previo, fin_anterior))
+    tiempos_espera = previo + inicio_cadena - tiempos_llegada
+    return tiempos_espera, acumulado[-1] + inicio_cadena[-1]
+
+
+def lindley_ciclico(tiempos_llegada, tiempos_en_caja, k, fin_anterior=None):
+    """
+    k cajas con reparto cíclico: el cliente i (desde 0) va a la caja i mod k.
+    :param fin_anterior: Arreglo de k con el fin de la última atención previa de cada caja.
+    :return: (tiempos_espera, tiempo_cajas) como gptvale.simular_fila_unica.
+    """
+    fin_anterior = np.zeros(k) if fin_anterior is None else fin_anterior
+    tiempos_espera = np.empty(len(tiempos_llegada))
+    tiempo_cajas = np.array(fin_anterior, dtype=float)
+    for caja in range(k):
+        tiempos_espera[caja::k], tiempo_cajas[caja] = lindley(tiempos_llegada[caja::k], tiempos_en_caja[caja::k],
+                                                              fin_anterior[caja])
+    return tiempos_espera, tiempo_cajas
+
+
+def _generar_trozo(semilla, cantidad, parametros):
+    # Llegadas del trozo contadas desde la última llegada del trozo anterior
+    return gptvale.generar_clientes(cantidad, np.random.default_rng(semilla), **parametros)
+
+
+def _resumir_trozo(semilla, cantidad, k, parametros):
+    # Primera pasada: lo que el trozo le hace al fin de cada caja, sin saber cómo empieza
+    tiempos_llegada, tiempos_en_caja = _generar_trozo(semilla, cantidad, parametros)
+    suma_servicio = np.zeros(k)
+    maximo = np.full(k, -np.inf)
+    for caja in range(min(k, cantidad)):
+        duraciones = tiempos_en_caja[caja::k]
+        acumulado = np.cumsum(duraciones)
+        suma_servicio[caja] = acumulado[-1]
+        maximo[caja] = np.max(tiempos_llegada[caja::k] - (acumulado - duraciones))
+    return float(tiempos_llegada[-1]), suma_servicio, maximo
+
+
+def _estadisticas_trozo(semilla, cantidad, k, desplazamiento, fin_anterior, parametros):
+    # Segunda pasada: ya se conoce el estado inicial, se resuelve el trozo y se resume
+    tiempos_llegada, tiempos_en_caja = _generar_trozo(semilla, cantidad, parametros)
+    tiempos_espera, _ = lindley_ciclico(tiempos_llegada + desplazamiento, tiempos_en_caja, k, fin_anterior)
+    espera = Acumulador()
+    espera.agregar_lote(tiempos_espera)
+    return espera, float(tiempos_en_caja.sum())
+
+
+def simular_en_paralelo(num_clientes, k=1, semilla=None, tamano_trozo=10_000_000, procesos=None, **parametros):
+    """
+    Corrida larga del modelo de gptvale.py con reparto cíclico entre k cajas (k=1 es una sola
+    caja), partida en trozos que se generan y resuelven en paralelo, en dos pasadas:
+      1. cada trozo se genera con su propia semilla y se resume (suma de llegadas, suma de
+         duraciones y máximo de llegada - trabajo previo, por caja);
+      2. los resúmenes se componen en orden para obtener el estado inicial de cada trozo, y
+         cada trozo se vuelve a generar (misma semilla) para calcular sus esperas.
+    La memoria depende de tamano_trozo y no de num_clientes.
+    :param parametros: Parámetros de gptvale.generar_clientes.
+    :return: Diccionario con clientes, espera_media, espera_desviacion, espera_maxima,
+             utilizacion y tiempo_cajas.
+    """
+    # Los trozos son múltiplos de k para que el cliente j del trozo vaya a la caja j mod k
+    tamano_trozo = max(k, tamano_trozo - tamano_trozo % k)
+    cantidades = [min(tamano_trozo, num_clientes - desde) for desde in range(0, num_clientes, tamano_trozo)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(cantidades))
+    procesos = min(procesos or os.cpu_count() or 1, len(cantidades))
+    pool = ProcessPoolExecutor(procesos) if procesos > 1 else None
+    mapear = map if pool is None else pool.map
+    try:
+        resumenes = list(mapear(_resumir_trozo, semillas, cantidades, [k] * len(cantidades),
+                                [parametros] * len(cantidades)))
+
+        # Composición en orden de los resúmenes: fin = suma_servicio + max(fin, desplazamiento + maximo)
+        desplazamientos, fines_anteriores = [], []
+        desplazamiento, fin = 0.0, np.zeros(k)
+        for suma_llegadas, suma_servicio, maximo in resumenes:
+            desplazamientos.append(desplazamiento)
+            fines_anteriores.append(fin)
+            fin = np.where(np.isfinite(maximo), suma_servicio + np.maximum(fin, desplazamiento + maximo), fin)
+            desplazamiento += suma_llegadas
+
+        resultados = list(mapear(_estadisticas_trozo, semillas, cantidades, [k] * len(cantidades),
+                                 desplazamientos, fines_anteriores, [parametros] * len(cantidades)))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    espera = Acumulador.combinar_todos(acumulador for acumulador, _ in resultados)
+    trabajo = sum(suma for _, suma in resultados)
+    return {
+        'clientes': num_clientes,
+        'espera_media': espera.media,
+        'espera_desviacion': espera.desviacion(),
+        'espera_maxima': espera.maximo,
+        'utilizacion': trabajo / (k * fin.max()),
+        'tiempo_cajas': fin,
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    for cajas, mu_llegadas in ((1, 8), (3, 3)):
+        inicio = time.perf_counter()
+        resultado = simular_en_paralelo(10 ** 7, cajas, semilla=0, mu_llegadas=mu_llegadas)
+        print(f"{cajas} caja(s), {resultado['clientes']} clientes: espera media = {resultado['espera_media']:.3f} min, "
+              f"utilización = {resultado['utilizacion']:.3f} ({time.perf_counter() - inicio:.1f} s)")
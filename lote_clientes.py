@@ -0,0 +1,234 @@
+import numpy as np
+
+from lindley import lindley
+
+# Parámetros por defecto del modelo de Cliente (los mismos que usan los scripts)
+MU_LLEGADAS = 3  # Media de la Poisson para el tiempo entre llegadas
+MEDIA_PRODUCTOS = 5  # Media de la normal truncada de productos
+DESVIACION_PRODUCTOS = 3  # Desviación estándar de la normal truncada de productos
+MINIMO_PRODUCTOS = 1
+MAXIMO_PRODUCTOS = 10
+P_PAGO_EFECTIVO = 0.4  # Probabilidad de pagar en efectivo
+TIEMPO_EFECTIVO = 2  # Tiempo en minutos si paga en efectivo
+TIEMPO_OTRO_MEDIO = 70 / 60  # Tiempo en minutos si paga con otro medio
+
+
+def normal_truncada(rng, n, media, desviacion, minimo, maximo):
+    """
+    Genera n muestras de una normal truncada a [minimo, maximo] por rechazo vectorizado.
+    Con los parámetros del modelo se acepta ~86% de cada tanda, así que alcanzan pocas pasadas.
+    """
+    muestras = np.empty(n)
+    faltan = np.arange(n)
+    while faltan.size:
+        x = rng.normal(media, desviacion, faltan.size)
+        aceptadas = (x >= minimo) & (x <= maximo)
+        muestras[faltan[aceptadas]] = x[aceptadas]
+        faltan = faltan[~aceptadas]
+    return muestras
+
+
+def llegadas_no_homogeneas(rng, inicios, tasas, horizonte):
+    """
+    Momentos de llegada de un proceso de Poisson con tasa constante por tramos, por
+    adelgazamiento (Lewis-Shedler) vectorizado: se generan de una vez las llegadas de un proceso
+    con la tasa máxima en [0, horizonte) y cada una se acepta con probabilidad tasa(t) / tasa máxima.
+    :param inicios: Comienzo (en minutos, creciente) de cada tramo; antes del primero la tasa es 0.
+    :param tasas: Clientes por minuto en cada tramo (1 / MU_LLEGADAS para el modelo de los scripts).
+    :param horizonte: Fin de la jornada; no hay llegadas después.
+    :return: Arreglo ordenado de momentos de llegada.
+    """
+    inicios = np.asarray(inicios, dtype=float)
+    tasas = np.asarray(tasas, dtype=float)
+    if len(inicios) != len(tasas) or np.any(np.diff(inicios) <= 0) or np.any(tasas < 0):
+        raise ValueError("inicios debe ser creciente y tener una tasa no negativa por tramo")
+    tasa_maxima = tasas.max(initial=0)
+    if tasa_maxima == 0 or horizonte <= 0:
+        return np.zeros(0)
+    # Dada la cantidad, las llegadas de un proceso homogéneo son uniformes ordenadas
+    candidatas = np.sort(rng.uniform(0, horizonte, rng.poisson(tasa_maxima * horizonte)))
+    tramo = np.searchsorted(inicios, candidatas, side='right') - 1
+    tasa = np.where(tramo >= 0, tasas[np.maximum(tramo, 0)], 0)
+    return candidatas[rng.random(len(candidatas)) * tasa_maxima < tasa]
+
+
+class ClienteBatch:
+    """
+    Lote de clientes guardado por columnas: un arreglo de NumPy por cada atributo de Cliente.
+    El cliente i del lote tiene id i + 1, igual que en los scripts.
+    """
+
+    def __init__(self, tiempo_llegada, productos, pago_efectivo,
+                 tiempo_efectivo=TIEMPO_EFECTIVO, tiempo_otro_medio=TIEMPO_OTRO_MEDIO):
+        n = len(tiempo_llegada)
+        self.id = np.arange(1, n + 1)
+        self.tiempo_llegada = np.asarray(tiempo_llegada)  # Tiempo desde la llegada anterior
+        self.tiempo_llegada_acumulado = np.cumsum(self.tiempo_llegada)
+        self.productos = np.asarray(productos)
+        self.pago_efectivo = np.asarray(pago_efectivo, dtype=bool)
+        self.tiempo_pago = np.where(self.pago_efectivo, tiempo_efectivo, tiempo_otro_medio)
+        self.tiempo_total = self.productos + self.tiempo_pago  # Tiempo total en la caja
+        self.tiempo_espera = np.zeros(n)  # Lo completan las cajas al atender el lote
+
+    @classmethod
+    def generar(cls, n, mu_llegadas=MU_LLEGADAS, media=MEDIA_PRODUCTOS, desviacion=DESVIACION_PRODUCTOS,
+                minimo=MINIMO_PRODUCTOS, maximo=MAXIMO_PRODUCTOS, p_pago_efectivo=P_PAGO_EFECTIVO,
+                tiempo_efectivo=TIEMPO_EFECTIVO, tiempo_otro_medio=TIEMPO_OTRO_MEDIO, rng=None):
+        """
+        Genera n clientes con unas pocas llamadas a NumPy en lugar de una por cliente.
+        :param n: Cantidad de clientes.
+        :param rng: Generador de NumPy; si es None se crea uno nuevo.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        # El primer cliente llega en el minuto 0, el resto según Poisson
+        tiempo_llegada = rng.poisson(mu_llegadas, n)
+        if n:
+            tiempo_llegada[0] = 0
+        productos, pago_efectivo = _sortear_atributos(rng, n, media, desviacion, minimo, maximo, p_pago_efectivo)
+        return cls(tiempo_llegada, productos, pago_efectivo, tiempo_efectivo, tiempo_otro_medio)
+
+    @classmethod
+    def generar_no_homogeneo(cls, inicios, tasas, horizonte, media=MEDIA_PRODUCTOS,
+                             desviacion=DESVIACION_PRODUCTOS, minimo=MINIMO_PRODUCTOS, maximo=MAXIMO_PRODUCTOS,
+                             p_pago_efectivo=P_PAGO_EFECTIVO, tiempo_efectivo=TIEMPO_EFECTIVO,
+                             tiempo_otro_medio=TIEMPO_OTRO_MEDIO, rng=None):
+        """
+        Genera los clientes de una jornada con tasa de llegada variable (horas pico), por ejemplo
+        inicios=[0, 240, 300], tasas=[1/3, 1, 1/3] para un pico al mediodía.
+        La cantidad de clientes es aleatoria; las llegadas no son enteras como con generar.
+        Ver llegadas_no_homogeneas.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        llegadas = llegadas_no_homogeneas(rng, inicios, tasas, horizonte)
+        productos, pago_efectivo = _sortear_atributos(rng, len(llegadas), media, desviacion, minimo, maximo,
+                                                      p_pago_efectivo)
+        lote = cls(np.diff(llegadas, prepend=0.0), productos, pago_efectivo, tiempo_efectivo, tiempo_otro_medio)
+        lote.tiempo_llegada_acumulado = llegadas  # Exactos, sin el redondeo de cumsum(diff)
+        return lote
+
+    # Nombres que usa gptvale.py para las mismas columnas
+    @property
+    def tiempos_llegada(self):
+        return self.tiempo_llegada_acumulado
+
+    @property
+    def tiempos_en_caja(self):
+        return self.tiempo_total
+
+    def __len__(self):
+        return len(self.id)
+
+    def cliente(self, i):
+        # Vista del cliente i: sus atributos leen y escriben en las columnas del lote
+        return VistaCliente(self, i)
+
+    def clientes(self, indices=None):
+        return (VistaCliente(self, i) for i in (range(len(self)) if indices is None else indices))
+
+    def describir(self, i):
+        # Mismo formato que Cliente.__str__ en gpttres.py
+        tipo_pago = "Efectivo" if self.pago_efectivo[i] else "Otro medio"
+        return (
+            f"Cliente {self.id[i]}: Llegada={self.tiempo_llegada[i]} min, "
+            f"Productos={self.productos[i]}, Pago={tipo_pago}, "
+            f"Tiempo Total={self.tiempo_total[i]:.2f} min, "
+            f"Tiempo de Espera={self.tiempo_espera[i]:.2f} min"
+        )
+
+
+def _columna(nombre):
+    def leer(vista):
+        return getattr(vista.lote, nombre)[vista.indice]
+
+    def escribir(vista, valor):
+        getattr(vista.lote, nombre)[vista.indice] = valor
+
+    return property(leer, escribir)
+
+
+class VistaCliente:
+    """
+    Cliente de un ClienteBatch con la misma interfaz que Cliente en los scripts, pero sin
+    __dict__: guarda solo el lote y el índice, y cada atributo es una celda de la columna
+    correspondiente (cliente.tiempo_espera = x escribe en lote.tiempo_espera).
+    """
+    __slots__ = ('lote', 'indice')
+
+    def __init__(self, lote, indice):
+        self.lote = lote
+        self.indice = indice
+
+    id = _columna('id')
+    tiempo_llegada = _columna('tiempo_llegada')
+    tiempo_llegada_acumulado = _columna('tiempo_llegada_acumulado')
+    productos = _columna('productos')
+    pago_efectivo = _columna('pago_efectivo')
+    tiempo_pago = _columna('tiempo_pago')
+    tiempo_total = _columna('tiempo_total')
+    tiempo_espera = _columna('tiempo_espera')
+
+    def __str__(self):
+        return self.lote.describir(self.indice)
+
+
+def _sortear_atributos(rng, n, media, desviacion, minimo, maximo, p_pago_efectivo):
+    # int() de los scripts trunca hacia cero; las muestras son positivas, así que alcanza con astype
+    productos = normal_truncada(rng, n, media, desviacion, minimo, maximo).astype(np.int64)
+    pago_efectivo = rng.random(n) < p_pago_efectivo
+    return productos, pago_efectivo
+
+
+def generar_en_bloques(n, tamano_bloque=1_000_000, rng=None, mu_llegadas=MU_LLEGADAS, **parametros):
+    """
+    Genera n clientes como una sucesión de ClienteBatch de a lo sumo tamano_bloque clientes.
+    Las llegadas y los ids siguen de un bloque al otro, como si fuera un solo lote.
+    :param parametros: Resto de los parámetros de ClienteBatch.generar.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    ultima_llegada = 0
+    for desde in range(0, n, tamano_bloque):
+        lote = generar_bloque(desde, min(tamano_bloque, n - desde), ultima_llegada, rng, mu_llegadas, **parametros)
+        ultima_llegada = lote.tiempo_llegada_acumulado[-1]
+        yield lote
+
+
+def generar_bloque(desde, cantidad, ultima_llegada, rng, mu_llegadas=MU_LLEGADAS, **parametros):
+    """
+    Bloque de generar_en_bloques que empieza en el cliente desde (índice global), después de
+    una llegada en ultima_llegada. Con el mismo estado de rng da el mismo bloque, así que una
+    corrida se puede retomar desde (desde, ultima_llegada, estado de rng).
+    """
+    lote = ClienteBatch.generar(cantidad, mu_llegadas=mu_llegadas, rng=rng, **parametros)
+    if desde:
+        # Solo el primer cliente de toda la corrida llega en 0
+        lote.tiempo_llegada[0] = rng.poisson(mu_llegadas)
+        lote.tiempo_llegada_acumulado = np.cumsum(lote.tiempo_llegada) + ultima_llegada
+        lote.id += desde
+    return lote
+
+
+def atender_en_caja(lote, indices, tiempo_fin_anterior=0):
+    """
+    Atiende en una sola caja, en orden, a los clientes del lote dados por indices.
+    Resuelve fin_i = max(llegada_i, fin_{i-1}) + total_i con el scan de lindley.lindley,
+    sin recorrer los clientes en Python. Escribe lote.tiempo_espera[indices].
+    :return: (tiempo_total_espera, tiempo_total_activa, tiempo_inactivo, tiempo_fin_ultima_atencion)
+    """
+    indices = np.asarray(indices)
+    if indices.size == 0:
+        return 0.0, 0.0, 0.0, tiempo_fin_anterior
+    llegadas = lote.tiempo_llegada_acumulado[indices]
+    totales = lote.tiempo_total[indices]
+    esperas, fin_ultima = lindley(llegadas, totales, tiempo_fin_anterior)
+    fin = llegadas + esperas + totales
+    lote.tiempo_espera[indices] = esperas
+
+    # Inactividad entre atenciones (como en gpttres.py, no se cuenta antes del primer cliente)
+    fines_previos = np.concatenate(([tiempo_fin_anterior], fin[:-1]))
+    huecos = np.maximum(0, llegadas - fines_previos)
+    if tiempo_fin_anterior <= 0:
+        huecos[0] = 0
+    return esperas.sum(), totales.sum(), huecos.sum(), fin_ultima
@@ -0,0 +1,145 @@
+"""
+Métricas ponderadas en el tiempo a partir de la llegada, el inicio de la atención y la salida
+de cada cliente: clientes en el sistema (L), en la fila (Lq) y utilización de cada caja, como
+promedios de toda la corrida y como curvas por tramos de tiempo.
+
+Cada cantidad es una función escalón que sube en unos tiempos y baja en otros; se arma
+ordenando los saltos y acumulándolos, y los promedios por tramo se sacan de la integral
+acumulada evaluada con searchsorted. Todo es O(n log n) con NumPy, sin recorrer los eventos.
+"""
+import numpy as np
+
+
+def escalon(subidas, bajadas):
+    """
+    Función escalón que suma 1 en cada tiempo de subidas y resta 1 en cada tiempo de bajadas.
+    :return: (tiempos, niveles): tiempos sin repetir, en orden, y el valor desde cada tiempo
+             hasta el siguiente. Antes del primer tiempo vale 0.
+    """
+    tiempos = np.concatenate((np.asarray(subidas, dtype=float), np.asarray(bajadas, dtype=float)))
+    saltos = np.concatenate((np.ones(len(subidas), dtype=np.int64), np.full(len(bajadas), -1, dtype=np.int64)))
+    orden = np.argsort(tiempos, kind='stable')
+    tiempos = tiempos[orden]
+    niveles = np.cumsum(saltos[orden])
+    # Con varios saltos en el mismo tiempo vale el nivel después del último
+    ultimo = np.append(tiempos[1:] != tiempos[:-1], True)
+    return tiempos[ultimo], niveles[ultimo]
+
+
+def integral_acumulada(tiempos, niveles, puntos):
+    # Integral del escalón desde el primer tiempo hasta cada punto
+    if len(tiempos) == 0:
+        return np.zeros(len(puntos))
+    acumulada = np.concatenate(([0.0], np.cumsum(niveles[:-1] * np.diff(tiempos))))
+    puntos = np.asarray(puntos, dtype=float)
+    posiciones = np.searchsorted(tiempos, puntos, side='right') - 1
+    anteriores = posiciones < 0  # Antes del primer tiempo el escalón vale 0
+    posiciones = np.maximum(posiciones, 0)
+    integral = acumulada[posiciones] + niveles[posiciones] * (puntos - tiempos[posiciones])
+    return np.where(anteriores, 0.0, integral)
+
+
+def promedios_por_tramo(tiempos, niveles, bordes):
+    """
+    Promedio en el tiempo del escalón en cada tramo [bordes[i], bordes[i + 1]).
+    :return: Arreglo de len(bordes) - 1 promedios.
+    """
+    bordes = np.asarray(bordes, dtype=float)
+    return np.diff(integral_acumulada(tiempos, niveles, bordes)) / np.diff(bordes)
+
+
+def promedio_temporal(tiempos, niveles, desde, hasta):
+    return float(promedios_por_tramo(tiempos, niveles, [desde, hasta])[0])
+
+
+def valores_en(tiempos, niveles, puntos):
+    # Valor del escalón en cada punto (0 antes del primer tiempo)
+    posiciones = np.searchsorted(tiempos, puntos, side='right') - 1
+    return np.where(posiciones >= 0, niveles[np.maximum(posiciones, 0)], 0)
+
+
+def metricas_temporales(llegadas, inicios, salidas, cajas, num_cajas=None, num_tramos=100, desde=0.0, hasta=None):
+    """
+    L, Lq y utilización ponderados en el tiempo entre desde y hasta.
+    :param llegadas: Llegada de cada cliente atendido.
+    :param inicios: Inicio de su atención.
+    :param salidas: Fin de su atención.
+    :param cajas: Caja que lo atendió (desde 0).
+    :param hasta: Fin del horizonte; por defecto la última salida.
+    :return: Diccionario con L, Lq, Lq_maximo, utilizacion (por caja), utilizacion_media,
+             tiempo_ocupado y tiempo_inactivo (por caja, en el horizonte), y las curvas
+             bordes, L_tramos, Lq_tramos y utilizacion_tramos (num_cajas × num_tramos).
+    """
+    llegadas = np.asarray(llegadas, dtype=float)
+    inicios = np.asarray(inicios, dtype=float)
+    salidas = np.asarray(salidas, dtype=float)
+    cajas = np.asarray(cajas)
+    if num_cajas is None:
+        num_cajas = int(cajas.max()) + 1 if len(cajas) else 1
+    if hasta is None:
+        hasta = float(salidas.max()) if len(salidas) else desde
+    if hasta <= desde:
+        raise ValueError("El horizonte debe terminar después de empezar")
+    bordes = np.linspace(desde, hasta, num_tramos + 1)
+
+    en_sistema = escalon(llegadas, salidas)
+    en_fila = escalon(llegadas, inicios)
+    # Cada caja atiende a un cliente por vez: su escalón de ocupación vale 0 o 1. Se ordena una
+    # sola vez por caja y cada caja queda en un tramo contiguo, sin recorrer los n clientes por caja
+    orden = np.argsort(cajas, kind='stable')
+    cortes = np.searchsorted(cajas[orden], np.arange(num_cajas + 1))
+    inicios_por_caja, salidas_por_caja = inicios[orden], salidas[orden]
+    ocupacion = [escalon(inicios_por_caja[desde_caja:hasta_caja], salidas_por_caja[desde_caja:hasta_caja])
+                 for desde_caja, hasta_caja in zip(cortes[:-1], cortes[1:])]
+    utilizacion_tramos = np.array([promedios_por_tramo(*escalon_caja, bordes) for escalon_caja in ocupacion])
+    utilizacion = np.array([promedio_temporal(*escalon_caja, desde, hasta) for escalon_caja in ocupacion])
+
+    dentro = (en_fila[0] >= desde) & (en_fila[0] < hasta)
+    horizonte = hasta - desde
+    return {
+        'desde': desde,
+        'hasta': hasta,
+        'L': promedio_temporal(*en_sistema, desde, hasta),
+        'Lq': promedio_temporal(*en_fila, desde, hasta),
+        'Lq_maximo': int(max(en_fila[1][dentro].max(initial=0), valores_en(*en_fila, [desde])[0])),
+        'utilizacion': utilizacion,
+        'utilizacion_media': float(utilizacion.mean()),
+        'tiempo_ocupado': utilizacion * horizonte,
+        'tiempo_inactivo': (1 - utilizacion) * horizonte,
+        'bordes': bordes,
+        'L_tramos': promedios_por_tramo(*en_sistema, bordes),
+        'Lq_tramos': promedios_por_tramo(*en_fila, bordes),
+        'utilizacion_tramos': utilizacion_tramos,
+    }
+
+
+def metricas_motor(motor, tiempos_en_caja, **opciones):
+    """
+    metricas_temporales de un MotorEventos que corrió con guardar_clientes=True.
+    :param tiempos_en_caja: Duración de la atención de cada cliente, en el orden de llegada.
+    """
+    atendidos = motor.caja_asignada >= 0
+    inicios = motor.inicio_atencion[atendidos]
+    return metricas_temporales(motor.llegadas_guardadas[atendidos], inicios,
+                               inicios + np.asarray(tiempos_en_caja, dtype=float)[atendidos],
+                               motor.caja_asignada[atendidos], motor.num_cajas, **opciones)
+
+
+def metricas_trayectorias(registros, num_cajas=None, **opciones):
+    # Registros de trayectorias.py (pueden estar mapeados en memoria); se saltean los no atendidos
+    atendidos = registros['caja'] >= 0
+    return metricas_temporales(registros['llegada'][atendidos], registros['inicio'][atendidos],
+                               registros['salida'][atendidos], registros['caja'][atendidos], num_cajas, **opciones)
+
+
+if __name__ == "__main__":
+    from lote_clientes import ClienteBatch
+    from motor_eventos import FILA_POR_CAJA, FILA_UNICA, MotorEventos
+
+    lote = ClienteBatch.generar(100_000, mu_llegadas=3, rng=np.random.default_rng(0))
+    for disciplina in (FILA_UNICA, FILA_POR_CAJA):
+        motor = MotorEventos(3, lote.tiempos_llegada, lote.tiempos_en_caja, disciplina).ejecutar()
+        metricas = metricas_motor(motor, lote.tiempos_en_caja)
+        utilizaciones = ', '.join(f"{u:.3f}" for u in metricas['utilizacion'])
+        print(f"{disciplina}: L = {metricas['L']:.3f}, Lq = {metricas['Lq']:.3f} "
+              f"(máx. {metricas['Lq_maximo']}), utilización por caja = {utilizaciones}")
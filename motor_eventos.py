@@ -0,0 +1,386 @@
+import heapq
+from collections import deque
+
+import numpy as np
+
+from estadisticas import Acumulador
+from perfilado import PERFILADOR_INACTIVO
+
+# Disciplinas de fila (opciones 1 y 2 del menú de gpttres.py)
+FILA_UNICA = 'unica'
+FILA_POR_CAJA = 'por_caja'
+
+# Tipos de evento; a igual tiempo las salidas se procesan antes que las llegadas, y los
+# cambios de horario (apertura o cierre de una caja) antes que ambas
+HORARIO = -1
+SALIDA = 0
+LLEGADA = 1
+
+# Se suma a la cantidad de clientes de una caja cerrada para que nunca sea la de menos clientes
+_CERRADA = 10 ** 9
+
+
+class IndiceColas:
+    """
+    Cantidad de clientes en cada caja, con la caja de menos y la de más clientes en O(log k).
+    Usa dos heaps con borrado perezoso: cada cambio agrega una entrada nueva y las viejas
+    se descartan recién cuando llegan al tope. A igual cantidad gana la caja de menor id.
+    Las cajas cerradas (cantidad + _CERRADA) no entran en el heap de mayores: maxima es la
+    caja abierta con más clientes, o None si están todas cerradas.
+    """
+
+    def __init__(self, num_cajas):
+        self.cantidades = [0] * num_cajas
+        self.menores = [(0, c) for c in range(num_cajas)]
+        self.mayores = [(0, c) for c in range(num_cajas)]  # (-cantidad, caja)
+
+    def __getitem__(self, caja):
+        return self.cantidades[caja]
+
+    def cambiar(self, caja, delta):
+        cantidad = self.cantidades[caja] + delta
+        self.cantidades[caja] = cantidad
+        heapq.heappush(self.menores, (cantidad, caja))
+        if cantidad < _CERRADA:
+            heapq.heappush(self.mayores, (-cantidad, caja))
+        # Si se acumulan demasiadas entradas viejas, reconstruir los heaps
+        if len(self.menores) > 4 * len(self.cantidades) + 64:
+            self.menores = [(cantidad, c) for c, cantidad in enumerate(self.cantidades)]
+            self.mayores = [(-cantidad, c) for c, cantidad in enumerate(self.cantidades) if cantidad < _CERRADA]
+            heapq.heapify(self.menores)
+            heapq.heapify(self.mayores)
+
+    def minima(self):
+        menores = self.menores
+        while menores[0][0] != self.cantidades[menores[0][1]]:
+            heapq.heappop(menores)
+        return menores[0][1]
+
+    def maxima(self):
+        mayores = self.mayores
+        while mayores and -mayores[0][0] != self.cantidades[mayores[0][1]]:
+            heapq.heappop(mayores)
+        return mayores[0][1] if mayores else None
+
+
+class MotorEventos:
+    """
+    Simulación por eventos discretos de las cajas.
+    Los eventos (llegadas y salidas) van en una cola de prioridad y solo hay una llegada
+    pendiente a la vez, así que el heap de eventos nunca supera num_cajas + 1 elementos
+    y cada evento cuesta O(log k).
+    Los clientes se pueden pasar de una vez o por bloques con agregar_clientes; con
+    guardar_clientes=False solo se mantienen acumuladores y la memoria no crece con n.
+    :param num_cajas: Cantidad de cajas.
+    :param tiempos_llegada: Momento (acumulado) de llegada de cada cliente, ordenado.
+    :param tiempos_en_caja: Tiempo de atención de cada cliente.
+    :param disciplina: FILA_UNICA o FILA_POR_CAJA.
+    :param guardar_clientes: Si se guardan inicio de atención y caja de cada cliente.
+    :param trayectorias: Sumidero opcional (trayectorias.SumideroTrayectorias) que recibe el
+                         inicio, la salida y la caja de cada cliente.
+    :param jockeo: Con fila por caja, al liberarse un lugar el último de la fila más larga se
+                   cambia a esta caja si la diferencia de clientes es de al menos umbral_jockeo.
+    :param perfilador: perfilado.Perfilador opcional; cuenta eventos y mide la fase 'atencion'.
+    :param horarios: Opcional, una lista por caja de ventanas (abre, cierra) ordenadas, o None
+                     si la caja está siempre abierta. Al cerrar, la caja termina con el cliente
+                     que está atendiendo (y con fila por caja, también con los de su fila) pero no
+                     recibe clientes nuevos. El tiempo cerrada cuenta como tiempo inactivo.
+    """
+
+    def __init__(self, num_cajas, tiempos_llegada=None, tiempos_en_caja=None, disciplina=FILA_UNICA,
+                 guardar_clientes=True, trayectorias=None, jockeo=False, umbral_jockeo=2,
+                 perfilador=PERFILADOR_INACTIVO, horarios=None):
+        if disciplina not in (FILA_UNICA, FILA_POR_CAJA):
+            raise ValueError(f"Disciplina inválida: {disciplina}")
+        self.num_cajas = num_cajas
+        self.disciplina = disciplina
+        self.guardar_clientes = guardar_clientes
+        self.trayectorias = trayectorias
+        self.jockeo = jockeo
+        self.umbral_jockeo = umbral_jockeo
+        self.perfilador = perfilador
+
+        self.tiempo = 0.0  # Reloj de la simulación
+        self.eventos = []  # Heap de (tiempo, tipo, cliente o caja)
+        self.tiempos_llegada = []  # Bloque de clientes actual
+        self.tiempos_en_caja = []
+        self.desplazamiento = 0  # Índice global del primer cliente del bloque actual
+        self.siguiente_llegada = 0  # Índice (dentro del bloque) del próximo cliente por llegar
+
+        # Fila única: cajas libres ordenadas por (momento en que quedaron libres, id), como np.argmin
+        self.cajas_libres = [(0.0, c) for c in range(num_cajas)]
+        self.fila = deque()  # Clientes esperando como (índice global, llegada, duración)
+
+        # Fila por caja: una cola por caja y el índice de clientes en cada caja (en cola + en atención)
+        self.colas = [deque() for _ in range(num_cajas)]
+        self.indice_colas = IndiceColas(num_cajas)
+        self.en_caja = self.indice_colas.cantidades
+        self.ocupada = [False] * num_cajas
+        self.jockeos = 0  # Cantidad de clientes que se cambiaron de fila
+
+        # Acumuladores: se actualizan cuando cada cliente pasa a ser atendido
+        self.espera = Acumulador()
+        self.espera_por_caja = np.zeros(num_cajas)  # Tiempo total de espera en cada caja
+        self.atendidos = np.zeros(num_cajas, dtype=np.int64)
+        self.tiempo_activa = np.zeros(num_cajas)
+        self.tiempo_inactivo = np.zeros(num_cajas)  # Entre atenciones, sin contar antes del primer cliente
+        self.tiempo_fin = np.zeros(num_cajas)  # Fin de la última atención de cada caja
+
+        # Resultados por cliente (solo si guardar_clientes)
+        self.llegadas_guardadas = np.zeros(0)
+        self.inicio_atencion = np.zeros(0)
+        self.caja_asignada = np.zeros(0, dtype=np.int64)
+
+        self.horarios = horarios
+        if horarios is not None:
+            self._programar_horarios(horarios)
+
+        if tiempos_llegada is not None:
+            self.agregar_clientes(tiempos_llegada, tiempos_en_caja)
+
+    def __getstate__(self):
+        # Estado para los puntos de control (pickle). El perfilador y el sumidero de trayectorias
+        # no son parte de la simulación y se vuelven a conectar al retomar.
+        estado = self.__dict__.copy()
+        estado['perfilador'] = None
+        estado['trayectorias'] = None
+        if self.siguiente_llegada == len(self.tiempos_llegada):
+            # Bloque ya consumido: solo hace falta su largo, no las listas de llegadas y duraciones
+            estado['desplazamiento'] = self.desplazamiento + len(self.tiempos_llegada)
+            estado['tiempos_llegada'], estado['tiempos_en_caja'] = [], []
+            estado['siguiente_llegada'] = 0
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.perfilador = PERFILADOR_INACTIVO
+
+    def _programar_horarios(self, horarios):
+        if len(horarios) != self.num_cajas:
+            raise ValueError(f"Se esperaban horarios para {self.num_cajas} cajas, no {len(horarios)}")
+        self.abierta = [True] * self.num_cajas
+        self.cajas_abiertas = self.num_cajas
+        self.libres_cerradas = set()  # Cajas cerradas sin cliente (fila única)
+        for caja, ventanas in enumerate(horarios):
+            if ventanas is None:
+                continue
+            anterior = -np.inf
+            for abre, cierra in ventanas:
+                if not anterior <= abre < cierra:
+                    raise ValueError(f"Horario inválido para la caja {caja + 1}: {ventanas}")
+                anterior = cierra
+            # Cerrada desde el principio; la primera ventana la abre
+            self._cambio_horario(caja, False, 0.0)
+            for abre, cierra in ventanas:
+                heapq.heappush(self.eventos, (abre, HORARIO, (caja, True)))
+                if cierra < np.inf:
+                    heapq.heappush(self.eventos, (cierra, HORARIO, (caja, False)))
+
+    def agregar_clientes(self, tiempos_llegada, tiempos_en_caja):
+        # Solo se puede agregar un bloque cuando ya llegaron todos los clientes del anterior
+        if self.siguiente_llegada < len(self.tiempos_llegada):
+            raise RuntimeError("Todavía quedan llegadas pendientes del bloque anterior")
+        self.desplazamiento += len(self.tiempos_llegada)
+        # Listas de floats de Python: en el ciclo de eventos son más rápidas que escalares de NumPy
+        self.tiempos_llegada = np.asarray(tiempos_llegada, dtype=float).tolist()
+        self.tiempos_en_caja = np.asarray(tiempos_en_caja, dtype=float).tolist()
+        self.siguiente_llegada = 0
+        n = len(self.tiempos_llegada)
+        if self.guardar_clientes:
+            self.llegadas_guardadas = np.concatenate((self.llegadas_guardadas, tiempos_llegada))
+            self.inicio_atencion = np.concatenate((self.inicio_atencion, np.zeros(n)))
+            self.caja_asignada = np.concatenate((self.caja_asignada, np.full(n, -1, dtype=np.int64)))
+        if n:
+            heapq.heappush(self.eventos, (self.tiempos_llegada[0], LLEGADA, 0))
+        return self
+
+    def ejecutar(self, final=True):
+        # Con final=False se detiene al procesar la última llegada del bloque, para agregar otro
+        eventos = self.eventos
+        # Manejador de cada tipo de evento; con horarios se agregan los cambios de horario
+        if self.horarios is None:
+            manejadores = {LLEGADA: self._llegada, SALIDA: self._salida}
+        else:
+            manejadores = {LLEGADA: self._llegada_con_horario, SALIDA: self._salida_con_horario,
+                           HORARIO: self._horario}
+        procesados = 0
+        with self.perfilador.fase('atencion'):
+            while eventos and (final or self.siguiente_llegada < len(self.tiempos_llegada)):
+                tiempo, tipo, dato = heapq.heappop(eventos)
+                self.tiempo = tiempo
+                manejadores[tipo](dato, tiempo)
+                procesados += 1
+        # Cada evento procesado es un pop del heap y fue un push al agendarlo
+        self.perfilador.contar('eventos', procesados)
+        self.perfilador.contar('operaciones_heap_eventos', 2 * procesados)
+        return self
+
+    def _iniciar_atencion(self, cliente, llegada, duracion, caja, tiempo):
+        espera = tiempo - llegada
+        self.espera.agregar(espera)
+        self.espera_por_caja[caja] += espera
+        if self.atendidos[caja] and tiempo > self.tiempo_fin[caja]:
+            self.tiempo_inactivo[caja] += tiempo - self.tiempo_fin[caja]
+        self.atendidos[caja] += 1
+        self.tiempo_activa[caja] += duracion
+        if self.guardar_clientes:
+            self.inicio_atencion[cliente] = tiempo
+            self.caja_asignada[cliente] = caja
+        if self.trayectorias is not None:
+            self.trayectorias.registrar(cliente, tiempo, tiempo + duracion, caja)
+        heapq.heappush(self.eventos, (tiempo + duracion, SALIDA, caja))
+
+    def _llegada(self, i, tiempo):
+        # Agendar la próxima llegada del bloque
+        siguiente = i + 1
+        if siguiente < len(self.tiempos_llegada):
+            heapq.heappush(self.eventos, (self.tiempos_llegada[siguiente], LLEGADA, siguiente))
+        self.siguiente_llegada = siguiente
+        cliente = (self.desplazamiento + i, self.tiempos_llegada[i], self.tiempos_en_caja[i])
+
+        if self.disciplina == FILA_UNICA:
+            if self.cajas_libres:
+                _, caja = heapq.heappop(self.cajas_libres)
+                self._iniciar_atencion(*cliente, caja, tiempo)
+            else:
+                self.fila.append(cliente)
+        else:
+            self._asignar_por_caja(cliente, tiempo)
+
+    def _asignar_por_caja(self, cliente, tiempo):
+        # Cada cliente elige al llegar la caja con menos clientes
+        caja = self.indice_colas.minima()
+        self.indice_colas.cambiar(caja, 1)
+        if self.ocupada[caja]:
+            self.colas[caja].append(cliente)
+        else:
+            self.ocupada[caja] = True
+            self._iniciar_atencion(*cliente, caja, tiempo)
+
+    def _salida(self, caja, tiempo):
+        self.tiempo_fin[caja] = tiempo
+        if self.disciplina == FILA_UNICA:
+            if self.fila:
+                self._iniciar_atencion(*self.fila.popleft(), caja, tiempo)
+            else:
+                heapq.heappush(self.cajas_libres, (tiempo, caja))
+        else:
+            self.indice_colas.cambiar(caja, -1)
+            if self.colas[caja]:
+                self._iniciar_atencion(*self.colas[caja].popleft(), caja, tiempo)
+            else:
+                self.ocupada[caja] = False
+            if self.jockeo:
+                self._jockeo(caja, tiempo)
+
+    def _llegada_con_horario(self, i, tiempo):
+        if self.disciplina == FILA_UNICA or self.cajas_abiertas:
+            self._llegada(i, tiempo)
+            return
+        # Fila por caja con todas cerradas: el cliente espera en la fila común hasta que abra una
+        siguiente = i + 1
+        if siguiente < len(self.tiempos_llegada):
+            heapq.heappush(self.eventos, (self.tiempos_llegada[siguiente], LLEGADA, siguiente))
+        self.siguiente_llegada = siguiente
+        self.fila.append((self.desplazamiento + i, self.tiempos_llegada[i], self.tiempos_en_caja[i]))
+
+    def _salida_con_horario(self, caja, tiempo):
+        if self.abierta[caja] or self.disciplina == FILA_POR_CAJA:
+            self._salida(caja, tiempo)
+            return
+        # Fila única y caja cerrada: termina con el cliente actual y no toma otro
+        self.tiempo_fin[caja] = tiempo
+        self.libres_cerradas.add(caja)
+
+    def _horario(self, cambio, tiempo):
+        # Evento HORARIO: cambio = (caja, abre)
+        self._cambio_horario(*cambio, tiempo)
+
+    def _cambio_horario(self, caja, abre, tiempo):
+        if self.abierta[caja] == abre:
+            return
+        self.abierta[caja] = abre
+        self.cajas_abiertas += 1 if abre else -1
+        if self.disciplina == FILA_UNICA:
+            if abre:
+                if caja in self.libres_cerradas:
+                    self.libres_cerradas.discard(caja)
+                    if self.fila:
+                        self._iniciar_atencion(*self.fila.popleft(), caja, tiempo)
+                    else:
+                        heapq.heappush(self.cajas_libres, (tiempo, caja))
+            else:
+                # Si estaba libre se saca del heap; si está atendiendo, lo resuelve su salida
+                libres = [(t, c) for t, c in self.cajas_libres if c != caja]
+                if len(libres) < len(self.cajas_libres):
+                    self.cajas_libres[:] = libres
+                    heapq.heapify(self.cajas_libres)
+                    self.libres_cerradas.add(caja)
+        else:
+            self.indice_colas.cambiar(caja, -_CERRADA if abre else _CERRADA)
+            if abre:
+                while self.fila:
+                    self._asignar_por_caja(self.fila.popleft(), tiempo)
+
+    def _jockeo(self, caja, tiempo):
+        # El último cliente de la fila más larga pasa a la caja que acaba de liberar un lugar
+        larga = self.indice_colas.maxima()
+        if larga is None or self.en_caja[larga] - self.en_caja[caja] < self.umbral_jockeo or not self.colas[larga]:
+            return
+        cliente = self.colas[larga].pop()
+        self.indice_colas.cambiar(larga, -1)
+        self.indice_colas.cambiar(caja, 1)
+        self.jockeos += 1
+        if self.ocupada[caja]:
+            self.colas[caja].append(cliente)
+        else:
+            self.ocupada[caja] = True
+            self._iniciar_atencion(*cliente, caja, tiempo)
+
+    @property
+    def tiempos_espera(self):
+        return self.inicio_atencion - self.llegadas_guardadas
+
+    def tiempos_inactivos(self):
+        # Inactividad total de cada caja hasta el final de la simulación (como en gpttres.py)
+        tiempo_total = self.tiempo_fin.max()
+        return np.where(self.atendidos > 0, self.tiempo_inactivo + tiempo_total - self.tiempo_fin, tiempo_total)
+
+    def imprimir_resumen(self):
+        # Mismas líneas de resultados que imprime gpttres.py, calculadas desde los acumuladores
+        inactivos = self.tiempos_inactivos()
+        print("\nResultados:")
+        for c in range(self.num_cajas):
+            print(f"Caja {c + 1}: Clientes en Cola={self.atendidos[c]}")
+            print(f"Tiempo total de espera en la caja: {self.espera_por_caja[c]:.2f} min")
+            print(f"Tiempo total inactivo de la caja: {inactivos[c]:.2f} min")
+
+        print(f"\nTiempo total de la simulación: {self.tiempo_fin.max():.2f} min")
+
+        print(f"\nValor medio del tiempo de uso de las cajas: {np.mean(self.tiempo_activa):.2f} min")
+        print(f"Desviación estándar del tiempo de uso de las cajas: {np.std(self.tiempo_activa):.2f} min")
+        print(f"Valor medio del tiempo de espera de los clientes: {self.espera.media:.2f} min")
+        print(f"Desviación estándar del tiempo de espera de los clientes: {self.espera.desviacion():.2f} min")
+
+
+def simular_en_bloques(num_cajas, bloques, disciplina=FILA_UNICA):
+    """
+    Simula una corrida larga alimentando el motor con bloques (tiempos_llegada, tiempos_en_caja)
+    sin guardar datos por cliente, así que la memoria depende del tamaño del bloque y no de n.
+    """
+    motor = MotorEventos(num_cajas, disciplina=disciplina, guardar_clientes=False)
+    for tiempos_llegada, tiempos_en_caja in bloques:
+        motor.agregar_clientes(tiempos_llegada, tiempos_en_caja).ejecutar(final=False)
+    return motor.ejecutar()
+
+
+def simular_fila_unica(n, k, tiempos_llegada, tiempos_en_caja):
+    # Misma firma y resultado que gptvale.simular_fila_unica, pero en O(log k) por cliente
+    motor = MotorEventos(k, tiempos_llegada[:n], tiempos_en_caja[:n], FILA_UNICA).ejecutar()
+    return motor.tiempo_fin, motor.tiempos_espera
+
+
+def simular_filas_separadas(n, k, tiempos_llegada, tiempos_en_caja, jockeo=False):
+    # Cada cliente elige al llegar la caja con menos clientes (como gptvale.simular_filas_separadas)
+    motor = MotorEventos(k, tiempos_llegada[:n], tiempos_en_caja[:n], FILA_POR_CAJA, jockeo=jockeo).ejecutar()
+    return motor.tiempo_fin, motor.tiempos_espera
@@ -0,0 +1,74 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+
+class Perfilador:
+    """
+    Cronómetros por fase y contadores con nombre, para saber en qué se va el tiempo de una corrida.
+
+        perfilador = Perfilador()
+        with perfilador.fase('generacion'):
+            ...
+        perfilador.contar('eventos', 1000)
+        print(perfilador.reporte())
+    """
+
+    activo = True
+
+    def __init__(self):
+        self.segundos = defaultdict(float)
+        self.veces = defaultdict(int)
+        self.contadores = defaultdict(int)
+
+    @contextmanager
+    def fase(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.segundos[nombre] += time.perf_counter() - inicio
+            self.veces[nombre] += 1
+
+    def contar(self, nombre, cantidad=1):
+        self.contadores[nombre] += cantidad
+
+    def a_diccionario(self):
+        return {
+            'fases': {nombre: {'segundos': self.segundos[nombre], 'veces': self.veces[nombre]}
+                      for nombre in self.segundos},
+            'contadores': dict(self.contadores),
+        }
+
+    def guardar_json(self, ruta):
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(self.a_diccionario(), archivo, indent=2)
+
+    def reporte(self):
+        total = sum(self.segundos.values())
+        lineas = ["Fase                      Tiempo (s)      %   Veces"]
+        for nombre, segundos in sorted(self.segundos.items(), key=lambda item: -item[1]):
+            porcentaje = 100 * segundos / total if total else 0
+            lineas.append(f"{nombre:24} {segundos:11.4f} {porcentaje:6.1f} {self.veces[nombre]:7}")
+        lineas.append(f"{'Total':24} {total:11.4f}")
+        if self.contadores:
+            lineas.append("")
+            for nombre, cantidad in sorted(self.contadores.items()):
+                lineas.append(f"{nombre:24} {cantidad:>12}")
+        return "\n".join(lineas)
+
+
+class PerfiladorInactivo:
+    # Misma interfaz que Perfilador, sin costo: la fase es siempre el mismo contexto vacío
+    activo = False
+    _nulo = nullcontext()
+
+    def fase(self, nombre):
+        return self._nulo
+
+    def contar(self, nombre, cantidad=1):
+        pass
+
+
+PERFILADOR_INACTIVO = PerfiladorInactivo()
@@ -0,0 +1,211 @@
+"""
+Políticas de asignación de clientes a cajas.
+
+Una política reparte las cajas en grupos (cada grupo con su disciplina: fila única o fila por
+caja) y decide a qué grupo va cada cliente. La decisión se toma para todo el lote de una vez,
+con NumPy, mirando solo los atributos del cliente (productos, medio de pago, orden de llegada)
+y no el estado de las filas. Después cada grupo es una simulación independiente:
+  - un grupo de una caja se resuelve con la recursión de Lindley vectorizada (lindley.py);
+  - un grupo de varias cajas corre en el MotorEventos, solo con sus clientes.
+Así comparar diez políticas cuesta más o menos lo mismo que diez corridas comunes.
+
+Las políticas que dependen del estado (el cliente elige la caja con menos gente) se expresan
+como un grupo con disciplina FILA_POR_CAJA, que el MotorEventos ya resuelve con IndiceColas.
+
+    politica = crear('rapidas', cajas_rapidas=1, maximo_productos=3)
+    resultado = simular_politica(politica, 4, lote)
+
+Para agregar una política basta un objeto con grupos(num_cajas) y asignar(lote, num_cajas, rng),
+registrado con registrar(nombre, fabrica).
+"""
+import numpy as np
+
+from lindley import lindley
+from lote_clientes import ClienteBatch
+from motor_eventos import FILA_POR_CAJA, FILA_UNICA, MotorEventos
+
+
+class FilaUnica:
+    """Todas las cajas atienden una sola fila (np.argmin del tiempo de las cajas en gptvale.py)."""
+
+    def __init__(self, disciplina=FILA_UNICA):
+        self.disciplina = disciplina
+        self.nombre = 'fila_unica' if disciplina == FILA_UNICA else 'fila_por_caja'
+
+    def grupos(self, num_cajas):
+        return [(list(range(num_cajas)), self.disciplina)]
+
+    def asignar(self, lote, num_cajas, rng):
+        return np.zeros(len(lote), dtype=np.int64)
+
+
+class PorTurno:
+    """El cliente i va a la caja i mod k (la opción 1 de gpttres.py)."""
+
+    nombre = 'por_turno'
+
+    def grupos(self, num_cajas):
+        return [([caja], FILA_UNICA) for caja in range(num_cajas)]
+
+    def asignar(self, lote, num_cajas, rng):
+        return np.arange(len(lote)) % num_cajas
+
+
+class AlAzar:
+    """Cada cliente va a una caja elegida al azar, sin mirar las filas."""
+
+    nombre = 'al_azar'
+
+    def grupos(self, num_cajas):
+        return [([caja], FILA_UNICA) for caja in range(num_cajas)]
+
+    def asignar(self, lote, num_cajas, rng):
+        return rng.integers(num_cajas, size=len(lote))
+
+
+class _DosGrupos:
+    # Las primeras cantidad cajas son exclusivas de los clientes que cumplen la condición
+    tipo = ''
+
+    def __init__(self, cantidad=1, disciplina=FILA_UNICA):
+        self.cantidad = cantidad
+        self.disciplina = disciplina
+        self.nombre = f"{self.tipo}_{cantidad}"
+
+    def grupos(self, num_cajas):
+        if not 0 < self.cantidad < num_cajas:
+            raise ValueError(f"{self.nombre}: se necesitan entre 1 y {num_cajas - 1} cajas exclusivas, "
+                             f"no {self.cantidad}")
+        return [(list(range(self.cantidad)), self.disciplina),
+                (list(range(self.cantidad, num_cajas)), self.disciplina)]
+
+    def asignar(self, lote, num_cajas, rng):
+        return np.where(self.condicion(lote), 0, 1)
+
+
+class CajasRapidas(_DosGrupos):
+    """Cajas rápidas para los clientes con a lo sumo maximo_productos productos."""
+
+    tipo = 'rapidas'
+
+    def __init__(self, cajas_rapidas=1, maximo_productos=3, disciplina=FILA_UNICA):
+        super().__init__(cajas_rapidas, disciplina)
+        self.maximo_productos = maximo_productos
+
+    def condicion(self, lote):
+        return lote.productos <= self.maximo_productos
+
+
+class CajasEfectivo(_DosGrupos):
+    """Cajas solo para los que pagan en efectivo; el resto va a las demás."""
+
+    tipo = 'efectivo'
+
+    def __init__(self, cajas_efectivo=1, disciplina=FILA_UNICA):
+        super().__init__(cajas_efectivo, disciplina)
+
+    def condicion(self, lote):
+        return lote.pago_efectivo
+
+
+POLITICAS = {
+    'fila_unica': FilaUnica,
+    'fila_por_caja': lambda: FilaUnica(FILA_POR_CAJA),
+    'por_turno': PorTurno,
+    'al_azar': AlAzar,
+    'rapidas': CajasRapidas,
+    'efectivo': CajasEfectivo,
+}
+
+
+def registrar(nombre, fabrica):
+    # fabrica(**parametros) debe devolver un objeto con grupos(num_cajas) y asignar(lote, num_cajas, rng)
+    POLITICAS[nombre] = fabrica
+
+
+def crear(nombre, **parametros):
+    if nombre not in POLITICAS:
+        raise ValueError(f"Política desconocida: {nombre}")
+    return POLITICAS[nombre](**parametros)
+
+
+def simular_politica(politica, num_cajas, lote, rng=None):
+    """
+    Atiende el lote con la política dada.
+    :param lote: ClienteBatch (o cualquier objeto con tiempos_llegada, tiempos_en_caja y las
+                 columnas que mire la política).
+    :param rng: Generador para las políticas al azar.
+    :return: Diccionario con tiempos_espera y caja_asignada (por cliente, en orden de llegada),
+             tiempo_activa, tiempo_fin y atendidos (por caja).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    grupos = politica.grupos(num_cajas)
+    grupo_cliente = np.asarray(politica.asignar(lote, num_cajas, rng))
+    llegadas = np.asarray(lote.tiempos_llegada, dtype=float)
+    duraciones = np.asarray(lote.tiempos_en_caja, dtype=float)
+
+    tiempos_espera = np.zeros(len(llegadas))
+    caja_asignada = np.full(len(llegadas), -1, dtype=np.int64)
+    tiempo_activa = np.zeros(num_cajas)
+    tiempo_fin = np.zeros(num_cajas)
+    # Un solo ordenamiento para separar los clientes de todos los grupos (estable: siguen en orden de llegada)
+    orden = np.argsort(grupo_cliente, kind='stable')
+    cortes = np.searchsorted(grupo_cliente[orden], np.arange(len(grupos) + 1))
+    for g, (cajas, disciplina) in enumerate(grupos):
+        indices = orden[cortes[g]:cortes[g + 1]]
+        if len(indices) == 0:
+            continue
+        if len(cajas) == 1:
+            tiempos_espera[indices], tiempo_fin[cajas[0]] = lindley(llegadas[indices], duraciones[indices])
+            caja_asignada[indices] = cajas[0]
+            tiempo_activa[cajas[0]] = duraciones[indices].sum()
+        else:
+            motor = MotorEventos(len(cajas), llegadas[indices], duraciones[indices], disciplina).ejecutar()
+            tiempos_espera[indices] = motor.tiempos_espera
+            caja_asignada[indices] = np.asarray(cajas)[motor.caja_asignada]
+            tiempo_activa[cajas] = motor.tiempo_activa
+            tiempo_fin[cajas] = motor.tiempo_fin
+
+    return {
+        'politica': politica.nombre,
+        'tiempos_espera': tiempos_espera,
+        'caja_asignada': caja_asignada,
+        'tiempo_activa': tiempo_activa,
+        'tiempo_fin': tiempo_fin,
+        'atendidos': np.bincount(caja_asignada, minlength=num_cajas),
+    }
+
+
+def comparar_politicas(politicas, num_cajas, num_clientes, semilla=None, **parametros):
+    """
+    Simula las mismas llegadas (números aleatorios comunes) con cada política.
+    :param politicas: Objetos política o nombres del registro.
+    :param parametros: Parámetros de ClienteBatch.generar.
+    :return: Una fila por política con espera media, percentil 95, máxima y utilización de cada caja.
+    """
+    semilla_clientes, semilla_politicas = np.random.SeedSequence(semilla).spawn(2)
+    lote = ClienteBatch.generar(num_clientes, rng=np.random.default_rng(semilla_clientes), **parametros)
+    filas = []
+    for politica in politicas:
+        politica = crear(politica) if isinstance(politica, str) else politica
+        # Cada política sortea con su propio generador, igual para todas
+        resultado = simular_politica(politica, num_cajas, lote, np.random.default_rng(semilla_politicas))
+        tiempos_espera = resultado['tiempos_espera']
+        filas.append({
+            'politica': resultado['politica'],
+            'espera_media': float(tiempos_espera.mean()),
+            'espera_p95': float(np.percentile(tiempos_espera, 95)),
+            'espera_maxima': float(tiempos_espera.max()),
+            'utilizacion': (resultado['tiempo_activa'] / resultado['tiempo_fin'].max()).tolist(),
+        })
+    return filas
+
+
+if __name__ == "__main__":
+    politicas = [crear(nombre) for nombre in ('fila_unica', 'fila_por_caja', 'por_turno', 'al_azar')]
+    politicas += [CajasRapidas(1, 3), CajasRapidas(2, 3), CajasEfectivo(1), CajasEfectivo(2)]
+    for fila in comparar_politicas(politicas, 4, 1_000_000, semilla=0, mu_llegadas=2):
+        utilizaciones = ', '.join(f"{u:.2f}" for u in fila['utilizacion'])
+        print(f"{fila['politica']:14} espera media = {fila['espera_media']:8.3f}  p95 = {fila['espera_p95']:8.3f}  "
+              f"máx. = {fila['espera_maxima']:9.3f}  utilización = {utilizaciones}")
@@ -0,0 +1,150 @@
+"""
+Corridas largas del MotorEventos que se pueden retomar si el proceso se corta.
+
+Los clientes se generan por bloques (como generar_en_bloques) y, cada cierto tiempo, al
+terminar un bloque se guarda en un archivo binario todo lo necesario para seguir: el motor
+(heap de eventos, cajas libres, filas, acumuladores), el estado del generador de NumPy y el
+avance. Al retomar se generan los mismos bloques y el resultado es idéntico, bit a bit, al de
+una corrida sin cortes. Si la corrida guarda trayectorias, el archivo se vuelve a abrir y se
+siguen escribiendo; los registros escritos después del último punto de control se reescriben
+con los mismos valores.
+
+    python puntos_control.py correr control.bin --cajas 3 --clientes 100000000 --semilla 1
+    python puntos_control.py retomar control.bin
+"""
+import argparse
+import os
+import pickle
+import time
+
+import numpy as np
+
+from lote_clientes import generar_bloque
+from motor_eventos import FILA_POR_CAJA, FILA_UNICA, MotorEventos
+from trayectorias import SumideroTrayectorias
+
+FIRMA = b'SIMCAJAS'
+VERSION = 1
+
+
+def guardar_punto_control(ruta, estado):
+    # Se escribe aparte y se renombra: si el proceso muere a mitad de camino queda el punto anterior
+    temporal = ruta + '.tmp'
+    with open(temporal, 'wb') as archivo:
+        archivo.write(FIRMA + bytes([VERSION]))
+        pickle.dump(estado, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+
+
+def cargar_punto_control(ruta):
+    with open(ruta, 'rb') as archivo:
+        cabecera = archivo.read(len(FIRMA) + 1)
+        if cabecera[:len(FIRMA)] != FIRMA:
+            raise ValueError(f"{ruta} no es un punto de control")
+        if cabecera[len(FIRMA)] != VERSION:
+            raise ValueError(f"Versión de punto de control no soportada: {cabecera[len(FIRMA)]}")
+        return pickle.load(archivo)
+
+
+def _continuar(ruta, estado, rng, cada_segundos, perfilador, sumidero):
+    motor = estado['motor']
+    if perfilador is not None:
+        motor.perfilador = perfilador
+    motor.trayectorias = sumidero
+    ultimo_guardado = time.perf_counter()
+    while estado['desde'] < estado['num_clientes']:
+        cantidad = min(estado['tamano_bloque'], estado['num_clientes'] - estado['desde'])
+        lote = generar_bloque(estado['desde'], cantidad, estado['ultima_llegada'], rng, **estado['parametros'])
+        if sumidero is not None:
+            sumidero.escribir_clientes(estado['desde'], lote.tiempos_llegada, lote.productos, lote.pago_efectivo)
+        motor.agregar_clientes(lote.tiempos_llegada, lote.tiempos_en_caja).ejecutar(final=False)
+        estado['desde'] += cantidad
+        estado['ultima_llegada'] = float(lote.tiempo_llegada_acumulado[-1])
+        if time.perf_counter() - ultimo_guardado >= cada_segundos:
+            estado['rng'] = rng.bit_generator.state
+            if sumidero is not None:
+                # Las trayectorias quedan en disco hasta el punto de control, antes de guardarlo
+                sumidero.vaciar()
+                sumidero.registros.flush()
+            guardar_punto_control(ruta, estado)
+            ultimo_guardado = time.perf_counter()
+    motor.ejecutar()
+    if sumidero is not None:
+        sumidero.cerrar()
+        motor.trayectorias = None
+    return motor
+
+
+def simular_con_puntos_control(ruta, num_cajas, num_clientes, disciplina=FILA_UNICA, tamano_bloque=1_000_000,
+                               semilla=None, cada_segundos=300, guardar_clientes=False, perfilador=None,
+                               ruta_trayectorias=None, **parametros):
+    """
+    Corre el MotorEventos sobre num_clientes clientes generados por bloques y guarda un punto de
+    control en ruta, al terminar un bloque, si pasaron cada_segundos desde el anterior.
+    :param ruta_trayectorias: Archivo .npy opcional para la trayectoria de cada cliente (ver
+                              trayectorias.py); al retomar se sigue escribiendo en el mismo.
+    :param parametros: Parámetros de ClienteBatch.generar.
+    :return: El motor, con sus acumuladores.
+    """
+    rng = np.random.default_rng(semilla)
+    motor = MotorEventos(num_cajas, disciplina=disciplina, guardar_clientes=guardar_clientes)
+    estado = {
+        'motor': motor,
+        'rng': rng.bit_generator.state,
+        'desde': 0,  # Clientes ya generados y entregados al motor
+        'ultima_llegada': 0.0,
+        'num_clientes': num_clientes,
+        'tamano_bloque': tamano_bloque,
+        'parametros': parametros,
+        'ruta_trayectorias': ruta_trayectorias,
+    }
+    sumidero = None if ruta_trayectorias is None else SumideroTrayectorias(ruta_trayectorias, num_clientes)
+    return _continuar(ruta, estado, rng, cada_segundos, perfilador, sumidero)
+
+
+def retomar(ruta, cada_segundos=300, perfilador=None):
+    """
+    Sigue la corrida guardada en ruta hasta el final, con los mismos parámetros.
+    :return: El motor, igual al de la corrida sin cortes.
+    """
+    estado = cargar_punto_control(ruta)
+    rng = np.random.default_rng()
+    rng.bit_generator.state = estado['rng']
+    ruta_trayectorias = estado.get('ruta_trayectorias')
+    sumidero = None if ruta_trayectorias is None else SumideroTrayectorias.reabrir(ruta_trayectorias)
+    return _continuar(ruta, estado, rng, cada_segundos, perfilador, sumidero)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Corridas largas con puntos de control.")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    correr = comandos.add_parser('correr', help="Empezar una corrida")
+    correr.add_argument('ruta', help="Archivo del punto de control")
+    correr.add_argument('--cajas', type=int, default=3)
+    correr.add_argument('--clientes', type=int, default=10 ** 7)
+    correr.add_argument('--disciplina', choices=[FILA_UNICA, FILA_POR_CAJA], default=FILA_UNICA)
+    correr.add_argument('--bloque', type=int, default=1_000_000, help="Clientes por bloque")
+    correr.add_argument('--semilla', type=int)
+    correr.add_argument('--mu-llegadas', type=float, default=3)
+    correr.add_argument('--trayectorias', metavar='ARCHIVO', help="Guardar la trayectoria de cada cliente (.npy)")
+    retomar_corrida = comandos.add_parser('retomar', help="Seguir una corrida desde su punto de control")
+    retomar_corrida.add_argument('ruta', help="Archivo del punto de control")
+    for subparser in (correr, retomar_corrida):
+        subparser.add_argument('--cada-segundos', type=float, default=300, help="Tiempo entre puntos de control")
+    args = parser.parse_args(argumentos)
+
+    if args.comando == 'correr':
+        motor = simular_con_puntos_control(args.ruta, args.cajas, args.clientes, args.disciplina, args.bloque,
+                                           args.semilla, args.cada_segundos, ruta_trayectorias=args.trayectorias,
+                                           mu_llegadas=args.mu_llegadas)
+    else:
+        motor = retomar(args.ruta, args.cada_segundos)
+    print(f"Clientes atendidos: {motor.espera.cantidad}")
+    print(f"Espera media: {motor.espera.media:.4f} min (desviación {motor.espera.desviacion():.4f})")
+    print(f"Tiempo total de la simulación: {motor.tiempo_fin.max():.2f} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import gptvale
+from motor_eventos import FILA_POR_CAJA, FILA_UNICA
+
+# Modelos de gptvale.py que se pueden replicar
+MODELOS = {
+    FILA_UNICA: gptvale.simular_fila_unica,
+    FILA_POR_CAJA: gptvale.simular_filas_separadas,
+}
+
+
+def intervalo_confianza(muestras, confianza=0.95):
+    """
+    Media e intervalo de confianza (t de Student) de un conjunto de réplicas independientes.
+    :return: (media, semiancho)
+    """
+    from scipy.stats import t  # Solo se importa si se pide un intervalo
+
+    muestras = np.asarray(muestras, dtype=float)
+    media = muestras.mean()
+    if len(muestras) < 2:
+        return media, np.inf
+    error = muestras.std(ddof=1) / np.sqrt(len(muestras))
+    return media, t.ppf((1 + confianza) / 2, len(muestras) - 1) * error
+
+
+def replicar(semillas, n, k, disciplina, parametros):
+    """
+    Corre una réplica del modelo de gptvale.py por cada semilla.
+    :return: Arreglo (len(semillas), 2) con espera media y utilización media de las cajas.
+    """
+    simular = MODELOS[disciplina]
+    resultados = np.empty((len(semillas), 2))
+    for j, semilla in enumerate(semillas):
+        rng = np.random.default_rng(semilla)
+        tiempos_llegada, tiempos_en_caja = gptvale.generar_clientes(n, rng, **parametros)
+        tiempo_cajas, tiempos_espera = simular(n, k, tiempos_llegada, tiempos_en_caja)
+        # Todo el trabajo se reparte entre k cajas hasta que termina la última atención
+        resultados[j] = tiempos_espera.mean(), tiempos_en_caja.sum() / (k * tiempo_cajas.max())
+    return resultados
+
+
+def ejecutar_replicas(num_replicas, n=gptvale.n, k=gptvale.k, disciplina=FILA_UNICA, semilla=None,
+                      procesos=None, confianza=0.95, **parametros):
+    """
+    Reparte num_replicas réplicas independientes entre un pool de procesos.
+    Cada réplica usa su propio generador, creado desde SeedSequence(semilla).spawn, así que
+    el resultado con una semilla dada no depende de la cantidad de procesos.
+    :param parametros: Parámetros de gptvale.generar_clientes (mu_llegadas, p_pago_efectivo, ...).
+    :return: Diccionario con media e intervalo de la espera y de la utilización.
+    """
+    semillas = np.random.SeedSequence(semilla).spawn(num_replicas)
+    procesos = min(procesos or os.cpu_count() or 1, num_replicas)
+    if procesos == 1:
+        resultados = _correr_semillas(None, 1, semillas, n, k, disciplina, parametros)
+    else:
+        with ProcessPoolExecutor(procesos) as pool:
+            resultados = _correr_semillas(pool, procesos, semillas, n, k, disciplina, parametros)
+    return _resumen(resultados, confianza)
+
+
+def _correr_semillas(pool, procesos, semillas, n, k, disciplina, parametros):
+    # Un trozo por proceso (o algunos más para balancear) para no pagar comunicación por réplica
+    trozos = [t for t in np.array_split(np.array(semillas, dtype=object), procesos * 4) if len(t)]
+    if pool is None:
+        resultados = [replicar(trozo, n, k, disciplina, parametros) for trozo in trozos]
+    else:
+        futuros = [pool.submit(replicar, trozo, n, k, disciplina, parametros) for trozo in trozos]
+        resultados = [futuro.result() for futuro in futuros]
+    return np.concatenate(resultados)
+
+
+def _resumen(resultados, confianza):
+    media_espera, semiancho_espera = intervalo_confianza(resultados[:, 0], confianza)
+    media_uso, semiancho_uso = intervalo_confianza(resultados[:, 1], confianza)
+    return {
+        'replicas': len(resultados),
+        'espera_media': media_espera,
+        'espera_semiancho': semiancho_espera,
+        'utilizacion_media': media_uso,
+        'utilizacion_semiancho': semiancho_uso,
+        'esperas': resultados[:, 0],
+        'utilizaciones': resultados[:, 1],
+    }
+
+
+def ejecutar_hasta_precision(precision_espera, relativa=False, precision_utilizacion=None, n=gptvale.n,
+                             k=gptvale.k, disciplina=FILA_UNICA, semilla=None, procesos=None, confianza=0.95,
+                             replicas_iniciales=20, maximo_replicas=100_000, **parametros):
+    """
+    Regla de parada secuencial: corre tandas de réplicas hasta que el semiancho del intervalo
+    de la espera media (y, si se pide, el de la utilización) sea a lo sumo la precisión pedida.
+    Cada tanda se dimensiona con la varianza estimada hasta el momento: si con m réplicas el
+    semiancho es h y el objetivo es h*, hacen falta unas m * (h / h*)^2.
+    Las semillas salen de la misma SeedSequence(semilla) en orden, así que las primeras m
+    réplicas son las mismas que daría ejecutar_replicas(m, semilla=semilla).
+    :param precision_espera: Semiancho máximo de la espera media (en minutos, o fracción de la
+                             media si relativa=True).
+    :param precision_utilizacion: Igual para la utilización; None para no exigirla.
+    :param maximo_replicas: Tope de réplicas; si se alcanza se devuelve sin haber convergido.
+    :return: Diccionario como el de ejecutar_replicas, con 'tandas' y 'convergio'.
+    """
+    raiz = np.random.SeedSequence(semilla)
+    procesos = procesos or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(procesos) if procesos > 1 else None
+    resultados = np.empty((0, 2))
+    tanda = max(replicas_iniciales, 2)
+    tandas = 0
+    try:
+        while True:
+            tanda = min(tanda, maximo_replicas - len(resultados))
+            nuevos = _correr_semillas(pool, procesos, raiz.spawn(tanda), n, k, disciplina, parametros)
+            resultados = np.concatenate((resultados, nuevos))
+            tandas += 1
+            resumen = _resumen(resultados, confianza)
+
+            # Réplicas que faltan según el criterio más exigente; la precisión relativa se mide
+            # contra la media estimada (ej. 0.05 = ±5 %)
+            criterios = [('espera', precision_espera)]
+            if precision_utilizacion is not None:
+                criterios.append(('utilizacion', precision_utilizacion))
+            faltantes = 0
+            resumen['convergio'] = True
+            for nombre, precision in criterios:
+                media, semiancho = resumen[f'{nombre}_media'], resumen[f'{nombre}_semiancho']
+                objetivo = precision * abs(media) if relativa else precision
+                if semiancho > objetivo:
+                    resumen['convergio'] = False
+                    necesarias = len(resultados) * (semiancho / objetivo) ** 2 if objetivo > 0 else np.inf
+                    faltantes = max(faltantes, min(necesarias, maximo_replicas) - len(resultados))
+            if resumen['convergio'] or len(resultados) >= maximo_replicas:
+                break
+            # Un 10 % de margen porque la varianza también se estima; nunca menos de un trozo por proceso
+            tanda = max(int(np.ceil(faltantes * 1.1)), procesos)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    resumen['tandas'] = tandas
+    return resumen
+
+
+def simular_fila_unica_replicas(k, tiempos_llegada, tiempos_en_caja):
+    """
+    Fila única para R réplicas a la vez. tiempos_llegada y tiempos_en_caja tienen forma (R, n).
+    Se lleva una matriz (R, k) con los momentos en que queda libre cada caja, ordenada por fila
+    (recursión de cargas ordenadas de Kiefer-Wolfowitz): el cliente i de cada réplica va a la
+    columna 0, que es la caja que se libera primero, como np.argmin en gptvale.simular_fila_unica.
+    El ciclo en Python es sobre los n clientes; las R réplicas avanzan juntas en cada paso.
+    :return: (tiempo_cajas ordenado de forma (R, k), tiempos_espera de forma (R, n))
+    """
+    # Se trabaja transpuesto, (n, R) y (k, R), para que cada paso lea filas contiguas
+    llegadas = np.ascontiguousarray(np.asarray(tiempos_llegada, dtype=float).T)
+    duraciones = np.ascontiguousarray(np.asarray(tiempos_en_caja, dtype=float).T)
+    n, num_replicas = llegadas.shape
+    libres = np.zeros((k, num_replicas))
+    esperas = np.empty((n, num_replicas))
+    menor = np.empty(num_replicas)
+
+    for i in range(n):
+        primera = libres[0]
+        np.subtract(primera, llegadas[i], out=esperas[i])
+        np.maximum(esperas[i], 0, out=esperas[i])
+        # La caja que se libera primero queda libre de nuevo en max(llegada, libre) + duración
+        np.maximum(llegadas[i], primera, out=primera)
+        primera += duraciones[i]
+        # Solo la fila 0 cambió (y creció): una pasada de intercambios la devuelve a su lugar
+        for j in range(k - 1):
+            np.minimum(libres[j], libres[j + 1], out=menor)
+            np.maximum(libres[j], libres[j + 1], out=libres[j + 1])
+            libres[j] = menor
+
+    tiempo_cajas, tiempos_espera = libres.T, esperas.T
+    return tiempo_cajas, tiempos_espera
+
+
+def ejecutar_replicas_vectorizadas(num_replicas, n=gptvale.n, k=gptvale.k, semilla=None,
+                                   replicas_por_bloque=10_000, confianza=0.95, cache=None, **parametros):
+    """
+    Igual que ejecutar_replicas con fila única, pero en un solo proceso y con todas las réplicas
+    de un bloque simuladas juntas por simular_fila_unica_replicas.
+    :param replicas_por_bloque: Réplicas simuladas a la vez (acota la memoria a bloque x n).
+    :param cache: cache_clientes.CacheClientes opcional; con la misma semilla y parámetros de
+                  generación (por ejemplo, cambiando solo k) los clientes no se vuelven a generar.
+    """
+    rng = np.random.default_rng(semilla)
+    resultados = []
+    for desde in range(0, num_replicas, replicas_por_bloque):
+        forma = (min(replicas_por_bloque, num_replicas - desde), n)
+        if cache is None:
+            tiempos_llegada, tiempos_en_caja = gptvale.generar_clientes(forma, rng, **parametros)
+        else:
+            tiempos_llegada, tiempos_en_caja = cache.generar(gptvale.generar_clientes, rng, forma, **parametros)
+        tiempo_cajas, tiempos_espera = simular_fila_unica_replicas(k, tiempos_llegada, tiempos_en_caja)
+        utilizacion = tiempos_en_caja.sum(axis=1) / (k * tiempo_cajas[:, -1])
+        resultados.append(np.column_stack((tiempos_espera.mean(axis=1), utilizacion)))
+    return _resumen(np.concatenate(resultados), confianza)
+
+
+if __name__ == "__main__":
+    for disciplina in MODELOS:
+        resumen = ejecutar_replicas(200, disciplina=disciplina, semilla=0)
+        print(f"{disciplina}: espera media = {resumen['espera_media']:.2f} ± {resumen['espera_semiancho']:.2f} min, "
+              f"utilización = {resumen['utilizacion_media']:.3f} ± {resumen['utilizacion_semiancho']:.3f}")
@@ -0,0 +1,154 @@
+"""
+Gráficos que no dependen de la cantidad de clientes.
+
+Los datos por cliente se resumen primero con NumPy (histogramas, densidad 2D y bandas de
+percentiles a lo largo del índice de cliente), así que lo que se dibuja tiene siempre unos
+cientos de puntos aunque la corrida tenga millones de clientes. Se dibuja con el backend Agg,
+sin pantalla, a PNG o SVG según la extensión del archivo, y GraficadorEnSegundoPlano lo hace
+en otro proceso para que la simulación siguiente no espere.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def histograma(valores, bins=50):
+    conteos, bordes = np.histogram(valores, bins=bins)
+    return {'conteos': conteos, 'bordes': bordes}
+
+
+def bandas_percentiles(valores, num_tramos=200, percentiles=PERCENTILES):
+    """
+    Percentiles de valores (en orden de cliente) en num_tramos tramos consecutivos del índice.
+    :return: Diccionario con el índice central de cada tramo y una fila por percentil.
+    """
+    valores = np.asarray(valores)
+    num_tramos = max(1, min(num_tramos, len(valores)))
+    # Tramos del mismo tamaño; los primeros len % num_tramos llevan un cliente más
+    tramos = np.array_split(valores, num_tramos)
+    bandas = np.array([np.percentile(tramo, percentiles) for tramo in tramos]).T
+    tamanos = np.array([len(tramo) for tramo in tramos])
+    centros = np.cumsum(tamanos) - tamanos / 2
+    return {'indices': centros, 'percentiles': list(percentiles), 'bandas': bandas}
+
+
+def densidad_2d(x, y, bins=100):
+    # Como un hexbin, pero agregado de antemano en una grilla rectangular
+    conteos, bordes_x, bordes_y = np.histogram2d(x, y, bins=bins)
+    return {'conteos': conteos, 'bordes_x': bordes_x, 'bordes_y': bordes_y}
+
+
+def resumir(tiempos_llegada, tiempos_espera, tiempo_activa, titulo=''):
+    """
+    Resumen chico (se puede mandar a otro proceso) de una corrida para graficar.
+    :param tiempos_llegada: Momento de llegada de cada cliente, en orden.
+    :param tiempos_espera: Espera de cada cliente, en el mismo orden.
+    :param tiempo_activa: Tiempo activo de cada caja.
+    """
+    tiempos_espera = np.asarray(tiempos_espera, dtype=float)
+    return {
+        'titulo': titulo,
+        'num_clientes': len(tiempos_espera),
+        'tiempo_activa': np.asarray(tiempo_activa, dtype=float),
+        'histograma_espera': histograma(tiempos_espera),
+        'bandas_espera': bandas_percentiles(tiempos_espera),
+        'densidad_llegada_espera': densidad_2d(tiempos_llegada, tiempos_espera),
+    }
+
+
+def resumir_motor(motor, titulo=''):
+    # El motor tiene que haber corrido con guardar_clientes=True
+    return resumir(motor.llegadas_guardadas, motor.tiempos_espera, motor.tiempo_activa, titulo)
+
+
+def dibujar_resumen(resumen, ruta):
+    """
+    Dibuja el resumen en ruta (.png o .svg) con Agg. No usa pyplot, así que no abre ventanas
+    ni comparte estado global entre gráficos.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figura = Figure(figsize=(14, 9))
+    FigureCanvasAgg(figura)
+    ejes = figura.subplots(2, 2)
+
+    cajas_ids = np.arange(1, len(resumen['tiempo_activa']) + 1)
+    ejes[0, 0].bar(cajas_ids, resumen['tiempo_activa'], color='blue')
+    ejes[0, 0].set_xlabel('Cajas')
+    ejes[0, 0].set_ylabel('Tiempo Activo (min)')
+    ejes[0, 0].set_title('Tiempo Activo de Cada Caja')
+    if len(cajas_ids) <= 30:
+        ejes[0, 0].set_xticks(cajas_ids)
+
+    bandas = resumen['bandas_espera']
+    indices, valores = bandas['indices'], bandas['bandas']
+    ejes[0, 1].fill_between(indices, valores[0], valores[-1], color='green', alpha=0.2,
+                            label=f"p{bandas['percentiles'][0]}-p{bandas['percentiles'][-1]}")
+    ejes[0, 1].fill_between(indices, valores[1], valores[-2], color='green', alpha=0.4,
+                            label=f"p{bandas['percentiles'][1]}-p{bandas['percentiles'][-2]}")
+    ejes[0, 1].plot(indices, valores[len(valores) // 2], color='darkgreen', label='Mediana')
+    ejes[0, 1].set_xlabel('ID Cliente')
+    ejes[0, 1].set_ylabel('Tiempo de Espera (min)')
+    ejes[0, 1].set_title('Tiempo de Espera de los Clientes')
+    ejes[0, 1].legend()
+
+    histograma_espera = resumen['histograma_espera']
+    ejes[1, 0].stairs(histograma_espera['conteos'], histograma_espera['bordes'], fill=True, color='green')
+    ejes[1, 0].set_yscale('symlog')
+    ejes[1, 0].set_xlabel('Tiempo de Espera (min)')
+    ejes[1, 0].set_ylabel('Frecuencia')
+    ejes[1, 0].set_title('Distribución del Tiempo de Espera')
+
+    densidad = resumen['densidad_llegada_espera']
+    malla = ejes[1, 1].pcolormesh(densidad['bordes_x'], densidad['bordes_y'], densidad['conteos'].T,
+                                  cmap='viridis', norm='log' if densidad['conteos'].max() > 1 else None)
+    figura.colorbar(malla, ax=ejes[1, 1], label='Clientes')
+    ejes[1, 1].set_xlabel('Tiempo de Llegada (min)')
+    ejes[1, 1].set_ylabel('Tiempo de Espera (min)')
+    ejes[1, 1].set_title('Espera según el Momento de Llegada')
+
+    if resumen['titulo']:
+        figura.suptitle(f"{resumen['titulo']} ({resumen['num_clientes']} clientes)")
+    figura.tight_layout()
+    figura.savefig(ruta)
+
+
+class GraficadorEnSegundoPlano:
+    """
+    Dibuja resúmenes en un proceso aparte mientras el que llama sigue simulando.
+
+        with GraficadorEnSegundoPlano() as graficador:
+            for ...:
+                graficador.enviar(resumir_motor(motor), 'escenario.png')
+        # Al salir del with se esperan todos los gráficos pendientes
+    """
+
+    def __init__(self):
+        self._pool = ProcessPoolExecutor(1)
+        self._pendientes = []
+
+    def enviar(self, resumen, ruta):
+        futuro = self._pool.submit(dibujar_resumen, resumen, ruta)
+        self._pendientes.append(futuro)
+        return futuro
+
+    def esperar(self):
+        # Propaga el primer error de dibujo, si lo hubo
+        pendientes, self._pendientes = self._pendientes, []
+        for futuro in pendientes:
+            futuro.result()
+
+    def cerrar(self):
+        try:
+            self.esperar()
+        finally:
+            self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
@@ -1,26 +1,28 @@
 import random
 import numpy as np
 from collections import Counter
-from scipy.stats import truncnorm
-import matplotlib.pyplot as plt
+from distribuciones import crear
+from lote_clientes import ClienteBatch
 
 # Variable global para el tiempo
 tiempo = 0
 
 # Definir clase Cliente
 class Cliente:
-    def __init__(self, id):
+    def __init__(self, id, tiempo_llegada=None, productos=None, pago_efectivo=None):
         self.id = id 
-        self.tiempo_llegada = np.random.poisson(3)  # Tiempo de llegada en base a Distribución Poisson
-        self.productos = self.generar_productos()  # Llama a función que define número de productos
-        self.pago_efectivo = random.random() < 0.4  # Pago en efectivo (Bernoulli con probabilidad de 0.4)
+        # Si vienen de un ClienteBatch se usan esos valores, si no se sortean acá
+        self.tiempo_llegada = np.random.poisson(3) if tiempo_llegada is None else tiempo_llegada  # Tiempo de llegada en base a Distribución Poisson
+        self.productos = self.generar_productos() if productos is None else productos  # Número de productos
+        self.pago_efectivo = random.random() < 0.4 if pago_efectivo is None else pago_efectivo  # Pago en efectivo (Bernoulli con probabilidad de 0.4)
         self.tiempo_pago = 2 if self.pago_efectivo else 70 / 60  # Tiempo de pago en minutos dependiendo del método
         self.tiempo_total = self.productos + self.tiempo_pago  # Tiempo total
 
     # Función que define número de productos según Distribución normal con media 5 y desviación 3.
     def generar_productos(self, media=5, desviacion=3, minimo=1, maximo=10):
-        a, b = (minimo - media) / desviacion, (maximo - media) / desviacion # a = -1,3333333333...  -  b = 1,666666666...
-        return int(truncnorm.rvs(a, b, loc=media, scale=desviacion))
+        # Tabla alias armada una sola vez por juego de parámetros; ya incluye el int()
+        distribucion = crear('normal_truncada_entera', media=media, desviacion=desviacion, minimo=minimo, maximo=maximo)
+        return int(distribucion.muestrear()[0])
 
     def __str__(self):
         tipo_pago = "Efectivo" if self.pago_efectivo else "Otro medio"
@@ -58,50 +60,37 @@ def seleccionar_caja(cajas):
     # Seleccionar la caja con menos clientes en cola
     return min(cajas, key=lambda caja: caja.num_clientes_en_cola())
 
-# Crear lista de cajas
-num_cajas = 3
-cajas = [Caja(i) for i in range(1, num_cajas + 1)]
-
-# Crear lista de clientes y simular la atención
-clientes = []
-for i in range(10000):
-    cliente = Cliente(id=i + 1)
-    clientes.append(cliente)
-
-# Simular atención a clientes
-for cliente in clientes:
-    caja = seleccionar_caja(cajas)  # Seleccionar la caja con menos clientes
-    caja.atender_cliente(cliente)
-
-# Calcular tiempo inactivo para cada caja
-for caja in cajas:
-    caja.tiempo_inactivo = tiempo - (caja.tiempo_total_activa)
+# Simulación sin interacción: crea las cajas, genera y atiende a los clientes
+def simular(num_cajas=3, num_clientes=10000, rng=None):
+    global tiempo
+    tiempo = 0
 
-# Datos para graficar
-tiempos_activas = [caja.tiempo_total_activa for caja in cajas]
-tiempos_inactivos = [caja.tiempo_inactivo for caja in cajas]
-cajas_ids = [caja.id for caja in cajas]
+    # Crear lista de cajas
+    cajas = [Caja(i) for i in range(1, num_cajas + 1)]
 
-# Graficar tiempos activos
-plt.figure(figsize=(12, 5))
+    # Crear lista de clientes y simular la atención (todos generados de una vez)
+    lote = ClienteBatch.generar(num_clientes, rng=rng)
+    # Vistas sobre las columnas del lote en lugar de un objeto Cliente con su __dict__ por cliente
+    clientes = list(lote.clientes())
 
-# Gráfica de tiempo activo
-plt.subplot(1, 2, 1)
-plt.bar(cajas_ids, tiempos_activas, color='blue')
-plt.xlabel('Cajas')
-plt.ylabel('Tiempo Activo (min)')
-plt.title('Tiempo Activo de Cada Caja')
-plt.xticks(cajas_ids)
+    # Simular atención a clientes
+    for cliente in clientes:
+        caja = seleccionar_caja(cajas)  # Seleccionar la caja con menos clientes
+        caja.atender_cliente(cliente)
 
+    # Calcular tiempo inactivo para cada caja
+    for caja in cajas:
+        caja.tiempo_inactivo = tiempo - (caja.tiempo_total_activa)
 
-plt.tight_layout()
-plt.show()
+    return cajas, clientes
 
 def graficar_productos_por_cliente(clientes):
     """
     Genera un histograma que muestra la cantidad de clientes por número de productos.
     :param clientes: Lista de objetos Cliente.
     """
+    import matplotlib.pyplot as plt
+
     productos_por_cliente = [cliente.productos for cliente in clientes]
 
     plt.hist(productos_por_cliente, bins=range(1, 12), edgecolor='black', align='left')
@@ -111,6 +100,32 @@ def graficar_productos_por_cliente(clientes):
     plt.grid(axis='y', alpha=0.75)
     plt.show()
 
-# Ejemplo de uso
-clientes_prueba = [Cliente(i) for i in range(10000)]
-graficar_productos_por_cliente(clientes_prueba)
\ No newline at end of file
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    cajas, clientes = simular()
+
+    # Datos para graficar
+    tiempos_activas = [caja.tiempo_total_activa for caja in cajas]
+    tiempos_inactivos = [caja.tiempo_inactivo for caja in cajas]
+    cajas_ids = [caja.id for caja in cajas]
+
+    # Graficar tiempos activos
+    plt.figure(figsize=(12, 5))
+
+    # Gráfica de tiempo activo
+    plt.subplot(1, 2, 1)
+    plt.bar(cajas_ids, tiempos_activas, color='blue')
+    plt.xlabel('Cajas')
+    plt.ylabel('Tiempo Activo (min)')
+    plt.title('Tiempo Activo de Cada Caja')
+    plt.xticks(cajas_ids)
+
+
+    plt.tight_layout()
+    plt.show()
+
+    # Ejemplo de uso
+    lote_prueba = ClienteBatch.generar(10000)
+    clientes_prueba = list(lote_prueba.clientes())
+    graficar_productos_por_cliente(clientes_prueba)
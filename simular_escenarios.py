@@ -0,0 +1,155 @@
+"""
+Corre sin interacción muchos escenarios leídos de un archivo JSONL (un objeto JSON por línea)
+y escribe un registro JSON de resultados por escenario, a medida que termina cada uno.
+
+    python simular_escenarios.py escenarios.jsonl -o resultados.jsonl --graficos graficos/
+
+Campos de cada escenario (todos opcionales): num_cajas, num_clientes, mu_llegadas,
+p_pago_efectivo, disciplina ("unica"/"por_caja", o "1"/"2" como en el menú de gpttres.py),
+semilla y el resto de los parámetros de ClienteBatch.generar.
+matplotlib solo se importa si se piden gráficos, y se dibuja en un proceso aparte.
+Con --perfil se imprime en stderr cuánto tardó cada fase (generación, atención, estadísticas,
+gráficos) sumando todos los escenarios; con --perfil-json se guarda ese desglose en un archivo.
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+import reportes
+from cache_clientes import CACHE_CLIENTES
+from lote_clientes import generar_en_bloques
+from motor_eventos import FILA_POR_CAJA, FILA_UNICA, MotorEventos
+from perfilado import PERFILADOR_INACTIVO, Perfilador
+
+ESCENARIO_POR_DEFECTO = {
+    'num_cajas': 3,
+    'num_clientes': 100,
+    'disciplina': FILA_UNICA,
+    'semilla': None,
+}
+OPCIONES_MENU = {'1': FILA_UNICA, '2': FILA_POR_CAJA}
+TAMANO_BLOQUE = 1_000_000
+
+
+def leer_escenarios(archivo):
+    # Devuelve (número de línea, texto) salteando líneas vacías y comentarios
+    for numero, linea in enumerate(archivo, start=1):
+        linea = linea.strip()
+        if linea and not linea.startswith('#'):
+            yield numero, linea
+
+
+def simular_escenario(escenario, guardar_clientes=False, perfilador=PERFILADOR_INACTIVO):
+    """
+    Corre un escenario y devuelve (registro de resultados, motor).
+    :param guardar_clientes: Si el motor guarda las esperas de cada cliente (para graficar).
+    :param perfilador: perfilado.Perfilador opcional que mide cada fase de la corrida.
+    """
+    parametros = {**ESCENARIO_POR_DEFECTO, **escenario}
+    num_cajas = parametros.pop('num_cajas')
+    num_clientes = parametros.pop('num_clientes')
+    disciplina = OPCIONES_MENU.get(str(parametros.get('disciplina')), parametros.get('disciplina'))
+    parametros.pop('disciplina')
+    semilla = parametros.pop('semilla')
+    rng = np.random.default_rng(semilla)
+    if num_cajas <= 0 or num_clientes <= 0:
+        raise ValueError("num_cajas y num_clientes deben ser mayores que 0")
+
+    motor = MotorEventos(num_cajas, disciplina=disciplina, guardar_clientes=guardar_clientes,
+                         perfilador=perfilador)
+    if semilla is not None and num_clientes <= TAMANO_BLOQUE:
+        # Un solo bloque y reproducible: escenarios que solo cambian cajas o disciplina lo reutilizan
+        bloques = (CACHE_CLIENTES.lote(num_clientes, rng, **parametros) for _ in range(1))
+    else:
+        bloques = generar_en_bloques(num_clientes, TAMANO_BLOQUE, rng, **parametros)
+    while True:
+        # Los bloques se generan a demanda, así que la generación se mide en cada next()
+        with perfilador.fase('generacion'):
+            lote = next(bloques, None)
+        if lote is None:
+            break
+        perfilador.contar('clientes_generados', len(lote))
+        perfilador.contar('muestras', 3 * len(lote))  # Llegada, productos y medio de pago
+        motor.agregar_clientes(lote.tiempos_llegada, lote.tiempos_en_caja).ejecutar(final=False)
+    motor.ejecutar()
+
+    with perfilador.fase('estadisticas'):
+        registro = _registro(escenario, disciplina, motor)
+    return registro, motor
+
+
+def _registro(escenario, disciplina, motor):
+    tiempo_total = float(motor.tiempo_fin.max())
+    return {
+        'escenario': escenario,
+        'disciplina': disciplina,
+        'tiempo_total': tiempo_total,
+        'espera_media': motor.espera.media,
+        'espera_desviacion': motor.espera.desviacion(),
+        'espera_maxima': motor.espera.maximo,
+        'uso_medio': float(np.mean(motor.tiempo_activa)),
+        'uso_desviacion': float(np.std(motor.tiempo_activa)),
+        'utilizacion': (motor.tiempo_activa / tiempo_total).tolist(),
+        'tiempo_inactivo': motor.tiempos_inactivos().tolist(),
+        'atendidos': motor.atendidos.tolist(),
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Simula escenarios de cajas leídos de un archivo JSONL.")
+    parser.add_argument('escenarios', help="Archivo JSONL con un escenario por línea ('-' para stdin)")
+    parser.add_argument('-o', '--salida', help="Archivo JSONL de resultados (por defecto stdout)")
+    parser.add_argument('--graficos', metavar='DIRECTORIO', help="Guardar un gráfico por escenario en DIRECTORIO")
+    parser.add_argument('--formato', choices=['png', 'svg'], default='png', help="Formato de los gráficos")
+    parser.add_argument('--perfil', action='store_true', help="Imprimir en stderr el tiempo de cada fase")
+    parser.add_argument('--perfil-json', metavar='ARCHIVO', help="Guardar el tiempo de cada fase en ARCHIVO")
+    args = parser.parse_args(argumentos)
+    perfilador = Perfilador() if args.perfil or args.perfil_json else PERFILADOR_INACTIVO
+
+    entrada = sys.stdin if args.escenarios == '-' else open(args.escenarios, encoding='utf-8')
+    salida = sys.stdout if args.salida is None else open(args.salida, 'w', encoding='utf-8')
+    graficador = None
+    if args.graficos:
+        os.makedirs(args.graficos, exist_ok=True)
+        # Los gráficos se dibujan en otro proceso mientras se simula el escenario siguiente
+        graficador = reportes.GraficadorEnSegundoPlano()
+
+    errores = 0
+    try:
+        for numero, linea in leer_escenarios(entrada):
+            escenario = linea
+            try:
+                escenario = json.loads(linea)
+                registro, motor = simular_escenario(escenario, guardar_clientes=bool(args.graficos),
+                                                    perfilador=perfilador)
+                if graficador is not None:
+                    with perfilador.fase('graficos'):
+                        ruta = os.path.join(args.graficos, f"escenario_{numero}.{args.formato}")
+                        graficador.enviar(reportes.resumir_motor(motor, f"Escenario {numero}"), ruta)
+            except (TypeError, ValueError) as error:
+                # Un escenario inválido no corta el resto del lote
+                registro = {'escenario': escenario, 'error': str(error)}
+                errores += 1
+            registro['linea'] = numero
+            salida.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            salida.flush()
+    finally:
+        if graficador is not None:
+            with perfilador.fase('graficos'):
+                graficador.cerrar()
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+    if args.perfil:
+        print(perfilador.reporte(), file=sys.stderr)
+    if args.perfil_json:
+        perfilador.guardar_json(args.perfil_json)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
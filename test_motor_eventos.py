@@ -0,0 +1,16 @@
+import numpy as np
+
+from lote_clientes import ClienteBatch
+from motor_eventos import FILA_POR_CAJA, MotorEventos
+
+
+def test_jockeo_sigue_despues_de_cerrar_una_caja():
+    lote = ClienteBatch.generar(20000, mu_llegadas=3, rng=np.random.default_rng(0))
+    # La cuarta caja cierra en t=1 y no atiende a nadie más: debe dar lo mismo que tres cajas
+    con_cierre = MotorEventos(4, lote.tiempos_llegada, lote.tiempos_en_caja, FILA_POR_CAJA, jockeo=True,
+                              horarios=[None, None, None, [(0, 1)]]).ejecutar()
+    tres_cajas = MotorEventos(3, lote.tiempos_llegada, lote.tiempos_en_caja, FILA_POR_CAJA, jockeo=True).ejecutar()
+
+    assert con_cierre.jockeos > 0
+    assert con_cierre.jockeos == tres_cajas.jockeos
+    assert np.allclose(con_cierre.tiempos_espera, tres_cajas.tiempos_espera)
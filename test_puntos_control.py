@@ -0,0 +1,31 @@
+import filecmp
+
+import pytest
+
+import puntos_control
+
+
+def test_retomar_sigue_escribiendo_trayectorias(tmp_path, monkeypatch):
+    opciones = dict(num_cajas=3, num_clientes=50_000, tamano_bloque=7_000, semilla=2)
+    sin_cortes = puntos_control.simular_con_puntos_control(str(tmp_path / 'ref.bin'), cada_segundos=1e9,
+                                                           ruta_trayectorias=str(tmp_path / 'ref.npy'), **opciones)
+
+    # Se corta la corrida después del tercer punto de control
+    guardar = puntos_control.guardar_punto_control
+    guardados = []
+
+    def guardar_y_cortar(ruta, estado):
+        guardar(ruta, estado)
+        guardados.append(ruta)
+        if len(guardados) == 3:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(puntos_control, 'guardar_punto_control', guardar_y_cortar)
+    with pytest.raises(KeyboardInterrupt):
+        puntos_control.simular_con_puntos_control(str(tmp_path / 'control.bin'), cada_segundos=0,
+                                                  ruta_trayectorias=str(tmp_path / 'tray.npy'), **opciones)
+    monkeypatch.setattr(puntos_control, 'guardar_punto_control', guardar)
+
+    retomada = puntos_control.retomar(str(tmp_path / 'control.bin'), cada_segundos=0)
+    assert retomada.espera.media == sin_cortes.espera.media
+    assert filecmp.cmp(tmp_path / 'ref.npy', tmp_path / 'tray.npy', shallow=False)
@@ -0,0 +1,96 @@
+import numpy as np
+
+from lote_clientes import generar_en_bloques
+from motor_eventos import FILA_UNICA, MotorEventos
+
+# Registro de ancho fijo por cliente (40 bytes)
+TIPO_REGISTRO = np.dtype([
+    ('llegada', 'f8'),
+    ('inicio', 'f8'),  # Inicio de la atención
+    ('salida', 'f8'),
+    ('caja', 'i4'),  # Caja que lo atendió (desde 0); -1 si todavía no fue atendido
+    ('productos', 'i4'),
+    ('pago_efectivo', '?'),
+], align=True)
+
+
+class SumideroTrayectorias:
+    """
+    Escribe la trayectoria de cada cliente en un archivo .npy mapeado en memoria, por trozos,
+    mientras corre la simulación. El registro del cliente i queda en la posición i.
+    :param ruta: Archivo .npy a crear.
+    :param num_clientes: Cantidad total de clientes (fija el tamaño del archivo).
+    :param tamano_trozo: Registros que se juntan en memoria antes de bajarlos al archivo.
+    """
+
+    def __init__(self, ruta, num_clientes, tamano_trozo=65536):
+        self.ruta = ruta
+        self.registros = np.lib.format.open_memmap(ruta, mode='w+', dtype=TIPO_REGISTRO, shape=(num_clientes,))
+        self.registros['caja'] = -1
+        self.tamano_trozo = tamano_trozo
+        self._clientes, self._inicios, self._salidas, self._cajas = [], [], [], []
+
+    @classmethod
+    def reabrir(cls, ruta, tamano_trozo=65536):
+        # Sigue escribiendo en un archivo ya creado (al retomar una corrida) sin borrar lo escrito
+        sumidero = cls.__new__(cls)
+        sumidero.ruta = ruta
+        sumidero.registros = np.load(ruta, mmap_mode='r+')
+        sumidero.tamano_trozo = tamano_trozo
+        sumidero._clientes, sumidero._inicios, sumidero._salidas, sumidero._cajas = [], [], [], []
+        return sumidero
+
+    def escribir_clientes(self, desde, llegadas, productos, pago_efectivo):
+        # Columnas conocidas al generar el bloque: se escriben de una vez, en forma contigua
+        hasta = desde + len(llegadas)
+        self.registros['llegada'][desde:hasta] = llegadas
+        self.registros['productos'][desde:hasta] = productos
+        self.registros['pago_efectivo'][desde:hasta] = pago_efectivo
+
+    def registrar(self, cliente, inicio, salida, caja):
+        # Llamado por el motor cuando el cliente empieza a ser atendido
+        self._clientes.append(cliente)
+        self._inicios.append(inicio)
+        self._salidas.append(salida)
+        self._cajas.append(caja)
+        if len(self._clientes) >= self.tamano_trozo:
+            self.vaciar()
+
+    def vaciar(self):
+        if not self._clientes:
+            return
+        clientes = np.array(self._clientes, dtype=np.int64)
+        self.registros['inicio'][clientes] = self._inicios
+        self.registros['salida'][clientes] = self._salidas
+        self.registros['caja'][clientes] = self._cajas
+        self._clientes, self._inicios, self._salidas, self._cajas = [], [], [], []
+
+    def cerrar(self):
+        self.vaciar()
+        self.registros.flush()
+        del self.registros
+
+
+def abrir_trayectorias(ruta):
+    # Vuelve a abrir el archivo sin copiarlo a memoria; los campos se leen como registros['inicio']
+    return np.load(ruta, mmap_mode='r')
+
+
+def simular_con_trayectorias(ruta, num_cajas, num_clientes, disciplina=FILA_UNICA, tamano_bloque=1_000_000,
+                             rng=None, **parametros):
+    """
+    Corre el MotorEventos sobre clientes generados por bloques y guarda la trayectoria de
+    cada cliente en ruta. La memoria usada depende del bloque, no de num_clientes.
+    :param parametros: Parámetros de ClienteBatch.generar.
+    :return: El motor, con sus acumuladores.
+    """
+    sumidero = SumideroTrayectorias(ruta, num_clientes)
+    motor = MotorEventos(num_cajas, disciplina=disciplina, guardar_clientes=False, trayectorias=sumidero)
+    desde = 0
+    for lote in generar_en_bloques(num_clientes, tamano_bloque, rng, **parametros):
+        sumidero.escribir_clientes(desde, lote.tiempos_llegada, lote.productos, lote.pago_efectivo)
+        motor.agregar_clientes(lote.tiempos_llegada, lote.tiempos_en_caja).ejecutar(final=False)
+        desde += len(lote)
+    motor.ejecutar()
+    sumidero.cerrar()
+    return motor